@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""Offline benchmark for the newsletter pipeline
+
+Replays the recorded feed XML and Yahoo chart JSON in benchmarks/fixtures (no network, no SMTP)
+and synthetic scale-ups of them, timing each pipeline step separately. Results are JSON.
+
+    python benchmark.py                                   # fixtures, 100 and 1,000 feeds
+    python benchmark.py --scenario entries-100k           # 1,000 feeds x 100 entries
+    python benchmark.py --output bench.json --baseline previous.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+# Keep the benchmark's feed cache, price store etc. away from the real state directory
+STATE_DIR = tempfile.mkdtemp(prefix='newsbrief-bench-')
+os.environ['NEWSBRIEF_STATE_DIR'] = STATE_DIR
+os.environ.setdefault('NEWSBRIEF_PROFILES', os.path.join(STATE_DIR, 'profiles.json'))
+
+from financial_newsletter import Article, FinancialNewsletterBot, HttpResponse, np
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'fixtures')
+
+# name -> (feed count, entries per feed); None replays the recorded feeds as they are
+SCENARIOS = {
+    'fixtures': None,
+    'feeds-100': (100, 10),
+    'feeds-1000': (1000, 10),
+    'entries-100k': (1000, 100),
+}
+DEFAULT_SCENARIOS = ['fixtures', 'feeds-100', 'feeds-1000']
+
+# Word banks for synthetic stories (distinct enough that near-duplicate detection has real work to do)
+FIRMS = [
+    'KKR', 'Blackstone', 'Apollo', 'Carlyle', 'TPG', 'EQT', 'Ardian', 'Warburg Pincus', 'Bain Capital',
+    'Advent International', 'CVC Capital Partners', 'Brookfield', 'Thoma Bravo', 'Vista Equity Partners',
+    'Sequoia Capital', 'Accel', 'Ares', 'Permira', 'General Atlantic', 'Hellman & Friedman'
+]
+ACTIONS = [
+    'agrees to acquire', 'explores sale of', 'leads financing for', 'takes private', 'invests in',
+    'sells stake in', 'refinances debt of', 'weighs IPO of', 'closes continuation fund for', 'bids for'
+]
+SECTORS = [
+    'software', 'healthcare', 'logistics', 'fintech', 'data center', 'renewable power', 'chemicals',
+    'retail', 'insurance', 'media', 'semiconductor', 'education', 'aerospace', 'payments'
+]
+REGIONS = [
+    'US', 'European', 'UK', 'German', 'Nordic', 'Indian', 'Japanese', 'Canadian', 'French',
+    'Australian', 'Singapore', 'Brazilian'
+]
+MARKET_HEADLINES = [
+    'Wall Street {move} as Treasury yields {trend}', 'Oil prices {move} on {region} supply concerns',
+    'Dollar {move} against euro after {region} data', '{region} stocks {move} led by {sector} shares',
+    'Gold {move} as investors weigh {region} inflation'
+]
+NOISE_HEADLINES = [
+    '{region} football club sacks manager after poor run', 'Storm disrupts travel across {region} cities',
+    'Celebrity wedding draws crowds in {region} resort', '{region} election campaign enters final week'
+]
+SYLLABLES = ['ar', 'bel', 'cor', 'den', 'ex', 'fal', 'gen', 'hal', 'in', 'jor', 'kel', 'lum', 'mor',
+             'nov', 'or', 'pax', 'quin', 'ros', 'sol', 'tor', 'ul', 'ver', 'wes', 'xan', 'yor', 'zen']
+DEAL_SENTENCES = [
+    '{firm} {action} {company}, a {region} {sector} business, for about ${amount} billion.',
+    'The {sector} company {company} drew interest from {other} before talks with {firm} advanced.',
+    'People familiar with {company} said {firm} lined up {bank} to arrange ${amount} billion of debt.',
+    '{company} has grown {growth}% a year since {other} first backed it in {year}.',
+    'A {region} pension fund may roll its {company} stake into a vehicle run by {firm}.',
+    '{bank} and {other_bank} are advising on the {sector} process, which began in {month}.',
+]
+BANKS = ['Goldman Sachs', 'Morgan Stanley', 'JPMorgan', 'Lazard', 'Evercore', 'Barclays', 'UBS', 'Jefferies']
+MONTHS = ['January', 'March', 'May', 'June', 'August', 'September', 'November']
+
+
+class ReplayTransport:
+    """Stands in for the shared HTTP transport: serves recorded feeds by URL and chart JSON by symbol"""
+
+    def __init__(self, feed_documents, charts):
+        self.feed_documents = feed_documents
+        self.charts = charts
+
+    def get(self, url, params=None, headers=None, max_bytes=None, timeout=None):
+        if url in self.feed_documents:
+            return HttpResponse(url, 200, {}, self.feed_documents[url])
+        payload = self.charts.get(url.rsplit('/', 1)[-1])
+        content = json.dumps(payload).encode('utf-8') if payload else b''
+        return HttpResponse(url, 200 if payload else 404, {}, content, wire_bytes=len(content))
+
+    def close(self):
+        pass
+
+
+class ReplayBot(FinancialNewsletterBot):
+    """Newsletter bot whose feed and quote requests are answered from fixtures"""
+
+    def __init__(self, feed_documents, charts, entries_per_feed):
+        super().__init__()
+        self.financial_feeds = {source: f'fixture://{index}' for index, source in enumerate(feed_documents)}
+        self.feed_documents = {
+            self.financial_feeds[source]: document for source, document in feed_documents.items()
+        }
+        self.charts = charts
+        self.market_symbols = list(charts)
+        self.entries_per_feed = entries_per_feed
+        self.fetch_deadline = None  # Scale-ups may legitimately take longer than the live deadline
+        # Feeds go through the live parse path (FAST_FEED_PARSER=0 measures feedparser alone)
+        self.http = ReplayTransport(self.feed_documents, charts)
+
+    def get_alternative_rss_urls(self, source_name):
+        return []
+
+
+def load_fixtures():
+    """Recorded feeds (source -> XML) and charts (symbol -> JSON, shifted so the last bar is today)"""
+    with open(os.path.join(FIXTURES, 'manifest.json'), encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    feeds = {}
+    for source, path in manifest['feeds'].items():
+        with open(os.path.join(FIXTURES, path), 'rb') as f:
+            feeds[source] = f.read()
+
+    charts = {}
+    for symbol, path in manifest['charts'].items():
+        with open(os.path.join(FIXTURES, path), encoding='utf-8') as f:
+            chart = json.load(f)
+        result = chart['chart']['result'][0]
+        shift = (int(time.time()) - result['timestamp'][-1]) // 86400 * 86400
+        result['timestamp'] = [timestamp + shift for timestamp in result['timestamp']]
+        charts[symbol] = chart
+
+    return feeds, charts
+
+
+def synthetic_word(rng, syllables=3):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(syllables))
+
+
+def synthetic_story(rng):
+    """One made-up headline and HTML summary: mostly deals, some markets, some noise"""
+    company = synthetic_word(rng).title()
+    firm, action = rng.choice(FIRMS), rng.choice(ACTIONS)
+    region, sector = rng.choice(REGIONS), rng.choice(SECTORS)
+    amount = f'{rng.uniform(0.2, 15):.1f}'
+    roll = rng.random()
+    # Random filler words keep unrelated stories from sharing most of their word bigrams
+    filler = ' '.join(synthetic_word(rng, 2) for _ in range(rng.randint(6, 12)))
+
+    if roll < 0.7:
+        title = f'{firm} {action} {region} {sector} group {company} in ${amount}bn deal'
+        sentences = rng.sample(DEAL_SENTENCES, 2)
+        summary = ' '.join(sentence.format(
+            firm=firm, action=action, company=company, region=region, sector=sector, amount=amount,
+            other=rng.choice(FIRMS), bank=rng.choice(BANKS), other_bank=rng.choice(BANKS),
+            growth=rng.randint(5, 60), year=rng.randint(2010, 2024), month=rng.choice(MONTHS)
+        ) for sentence in sentences)
+        summary = f'<p>{summary} <i>{filler}</i></p>'
+    elif roll < 0.9:
+        title = rng.choice(MARKET_HEADLINES).format(
+            move=rng.choice(['rise', 'fall', 'climb', 'slip', 'rally']),
+            trend=rng.choice(['ease', 'jump', 'steady']), region=region, sector=sector
+        )
+        summary = f'<p>{company} {filler}; analysts at {firm} expect volatility.</p>'
+    else:
+        title = rng.choice(NOISE_HEADLINES).format(region=region)
+        summary = f'<p>Residents of {company} said {filler}.</p>'
+    return title, summary
+
+
+def synthetic_feeds(templates, feed_count, per_feed, seed=42):
+    """Build feed_count RSS documents of per_feed items; ~10% of items are syndicated copies"""
+    rng = random.Random(seed)
+    published = []
+    feeds = {}
+
+    for index in range(feed_count):
+        source = f'{templates[index % len(templates)]} ({index})'
+        items = []
+        for position in range(per_feed):
+            if published and rng.random() < 0.1:
+                title, summary = rng.choice(published)
+            else:
+                title, summary = synthetic_story(rng)
+                published.append((title, summary))
+            items.append(
+                '<item>'
+                f'<title>{escape(title)}</title>'
+                f'<link>https://example.com/{index}/{position}</link>'
+                f'<description>{escape(summary)}</description>'
+                '<pubDate>Fri, 16 Oct 2026 06:00:00 +0000</pubDate>'
+                '</item>'
+            )
+        feeds[source] = (
+            '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f'<title>{escape(source)}</title>' + ''.join(items) + '</channel></rss>'
+        ).encode('utf-8')
+
+    return feeds
+
+
+def best_of(repeat, func, setup=None):
+    """Fastest of repeat runs (setup, e.g. copying inputs, is not timed); returns (seconds, result)"""
+    best, result = None, None
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        started = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_scenario(name, feeds, charts, entries_per_feed, repeat):
+    """Time each pipeline step on its own, feeding every step the previous step's output"""
+    bot = ReplayBot(feeds, charts, entries_per_feed)
+    timings = {}
+
+    def record(stage, items, func, setup=None):
+        seconds, result = best_of(repeat, func, setup)
+        timings[stage] = {
+            'seconds': round(seconds, 6),
+            'items': items,
+            'per_item_us': round(seconds / items * 1e6, 3) if items else None
+        }
+        print(f"⏱️ {name}: {stage} {seconds:.3f}s ({items} items)", file=sys.stderr)
+        return result
+
+    parsed = record('parse_feeds', len(feeds), lambda: list(bot.stream_feeds()))
+    raw = [
+        (source, entry) for source, feed in parsed
+        for entry in feed.entries[:bot.entries_per_feed] if entry.get('title')
+    ]
+
+    summaries = [entry.get('summary', entry.title) for _, entry in raw]
+    cleaned = record('clean_summary', len(summaries), lambda: [bot.clean_summary(summary) for summary in summaries])
+    articles = [
+        Article(
+            entry.title, summary, link=entry.get('link', ''), source=source,
+            published=entry.get('published', 'Recent'), priority=bot.get_source_priority(source)
+        )
+        for (source, entry), summary in zip(raw, cleaned)
+    ]
+
+    keep = record('is_pe_vc_relevant', len(articles), lambda: [
+        bot.is_pe_vc_relevant(article.text, article.source)
+        for article in articles
+    ])
+    relevant = [article for article, relevant in zip(articles, keep) if relevant]
+
+    categories = record('categorize_article', len(relevant), lambda: [
+        bot.categorize_article(article.text) for article in relevant
+    ])
+    for article, category in zip(relevant, categories):
+        article.category = category
+
+    copies = lambda: ([article.copy() for article in relevant],)
+    unique = record('remove_duplicates', len(relevant), bot.remove_duplicates, copies)
+
+    copies = lambda: ([article.copy() for article in unique],)
+    ranked = record('prioritize_pe_vc_content', len(unique), bot.prioritize_pe_vc_content, copies)
+
+    market_data = record('get_market_data', len(charts), bot.get_market_data)
+
+    categorized = bot.organize_by_category(ranked)
+    # Only each section's quota is rendered; the rest of the candidates never reach the template
+    rendered = sum(len(categorized.get(category, [])[:quota]) for category, quota in bot.category_quotas.items())
+    newsletter = record(
+        'create_newsletter_html', rendered,
+        lambda: bot.create_newsletter_html(categorized, market_data)
+    )
+
+    record('end_to_end', len(raw), bot.fetch_financial_news)
+
+    return {
+        'name': name,
+        'feeds': len(feeds),
+        'entries': len(raw),
+        'relevant': len(relevant),
+        'unique': len(unique),
+        'html_bytes': len(newsletter.encode('utf-8')),
+        'timings': timings
+    }
+
+
+def compare(report, baseline, tolerance, noise_floor=0.005):
+    """List steps slower than baseline by more than tolerance (ignoring sub-noise-floor differences)"""
+    previous = {scenario['name']: scenario['timings'] for scenario in baseline.get('scenarios', [])}
+    regressions = []
+    for scenario in report['scenarios']:
+        for stage, timing in scenario['timings'].items():
+            before = previous.get(scenario['name'], {}).get(stage)
+            if not before:
+                continue
+            if timing['seconds'] > before['seconds'] * (1 + tolerance) and timing['seconds'] - before['seconds'] > noise_floor:
+                regressions.append({
+                    'scenario': scenario['name'],
+                    'stage': stage,
+                    'baseline_seconds': before['seconds'],
+                    'seconds': timing['seconds'],
+                    'ratio': round(timing['seconds'] / before['seconds'], 2) if before['seconds'] else None
+                })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark for the ScopeSignal pipeline")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS) + ['all'],
+                        help=f"scenario to run, repeatable (default: {', '.join(DEFAULT_SCENARIOS)})")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per step, the fastest is reported")
+    parser.add_argument('--output', help="write the JSON report here instead of stdout")
+    parser.add_argument('--baseline', help="previous JSON report to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed slowdown against the baseline before failing (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    names = args.scenario or DEFAULT_SCENARIOS
+    if 'all' in names:
+        names = list(SCENARIOS)
+
+    fixture_feeds, charts = load_fixtures()
+    report = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np is not None,
+        'repeat': args.repeat,
+        'scenarios': []
+    }
+
+    try:
+        for name in names:
+            shape = SCENARIOS[name]
+            if shape is None:
+                feeds, per_feed = fixture_feeds, 10
+            else:
+                feeds = synthetic_feeds(list(fixture_feeds), *shape)
+                per_feed = shape[1]
+
+            # The pipeline narrates every step; keep the benchmark output to the report itself
+            with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+                report['scenarios'].append(run_scenario(name, feeds, charts, per_feed, args.repeat))
+    finally:
+        shutil.rmtree(STATE_DIR, ignore_errors=True)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            report['regressions'] = compare(report, json.load(f), args.tolerance)
+        for regression in report['regressions']:
+            print(
+                f"❌ Regression in {regression['scenario']}/{regression['stage']}: "
+                f"{regression['baseline_seconds']:.3f}s -> {regression['seconds']:.3f}s",
+                file=sys.stderr
+            )
+        exit_code = 1 if report['regressions'] else 0
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+        print(f"✅ Benchmark report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,1661 @@
-import feedparser
-import requests
-import smtplib
-import schedule
 import time
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+IMPORT_STARTED = time.perf_counter()
+
 from datetime import datetime, timedelta
+import importlib
+import importlib.util
 import os
 import re
+import csv
+import io
+import argparse
+import bisect
 import json
+import multiprocessing
+import random
+import zlib
+import hashlib
+import heapq
+import html
+import sqlite3
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED, TimeoutError as FuturesTimeoutError
+from contextlib import contextmanager
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+try:
+    import numpy as np
+except ImportError:  # Price history store is optional; quotes fall back to full YTD fetches
+    np = None
+
+
+# Seconds spent importing each lazily loaded module (reported after the run)
+LAZY_IMPORT_TIMES = {}
+
+
+class LazyModule:
+    """Module proxy that imports on first attribute access, so unused modules cost nothing at startup"""
+    
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+    
+    def __getattr__(self, attr):
+        if self._module is None:
+            started = time.perf_counter()
+            self._module = importlib.import_module(self._name)
+            LAZY_IMPORT_TIMES[self._name] = time.perf_counter() - started
+        return getattr(self._module, attr)
+
+
+feedparser = LazyModule('feedparser')
+requests = LazyModule('requests')
+urllib3 = LazyModule('urllib3')
+smtplib = LazyModule('smtplib')
+bs4 = LazyModule('bs4')  # Optional: only the article enrichment stage needs it
+etree = LazyModule('lxml.etree')  # Optional: streaming fast path for feed parsing
+schedule = LazyModule('schedule')  # Only needed by the local scheduler and daemon mode
+
+IMPORTS_DONE = time.perf_counter()
+
+
+class RunMetrics:
+    """Spans, counters and latency histograms for one run, exportable as JSON or Prometheus text"""
+    
+    BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+    
+    def __init__(self, prefix='newsbrief'):
+        self.prefix = prefix
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self.counters = {}    # (name, labels) -> value
+        self.histograms = {}  # (name, labels) -> count/sum/min/max and per-bucket counts
+    
+    @staticmethod
+    def key(name, labels):
+        return name, tuple(sorted(labels.items()))
+    
+    @contextmanager
+    def span(self, name, **labels):
+        """Time a block into the latency histogram for name/labels"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+    
+    def observe(self, name, seconds, **labels):
+        key = self.key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = {
+                    'count': 0, 'sum': 0.0, 'min': seconds, 'max': seconds, 'buckets': [0] * (len(self.BUCKETS) + 1)
+                }
+            histogram['count'] += 1
+            histogram['sum'] += seconds
+            histogram['min'] = min(histogram['min'], seconds)
+            histogram['max'] = max(histogram['max'], seconds)
+            histogram['buckets'][bisect.bisect_left(self.BUCKETS, seconds)] += 1
+    
+    def count(self, name, value=1, **labels):
+        key = self.key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+    
+    def quantile(self, histogram, q):
+        """Upper bound of the bucket holding the q-quantile (the max for the overflow bucket)"""
+        target, seen = q * histogram['count'], 0
+        for bound, hits in zip(self.BUCKETS, histogram['buckets']):
+            seen += hits
+            if seen >= target:
+                return min(bound, histogram['max'])
+        return histogram['max']
+    
+    def report(self):
+        """JSON-serializable run report"""
+        with self._lock:
+            spans = [
+                {
+                    'name': name, 'labels': dict(labels), 'count': histogram['count'],
+                    'total_seconds': round(histogram['sum'], 6),
+                    'mean_seconds': round(histogram['sum'] / histogram['count'], 6),
+                    'min_seconds': round(histogram['min'], 6), 'max_seconds': round(histogram['max'], 6),
+                    'p50_seconds': round(self.quantile(histogram, 0.5), 6),
+                    'p95_seconds': round(self.quantile(histogram, 0.95), 6),
+                    'buckets': dict(zip([str(bound) for bound in self.BUCKETS] + ['+Inf'], histogram['buckets']))
+                }
+                for (name, labels), histogram in sorted(self.histograms.items())
+            ]
+            counters = [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self.counters.items())
+            ]
+        return {
+            'started_at': datetime.fromtimestamp(self.started).isoformat(timespec='seconds'),
+            'wall_seconds': round(time.time() - self.started, 3),
+            'spans': spans,
+            'counters': counters
+        }
+    
+    @staticmethod
+    def prometheus_labels(labels, **extra):
+        pairs = list(labels) + list(extra.items())
+        if not pairs:
+            return ''
+        escaped = (
+            f'{name}="' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+            for name, value in pairs
+        )
+        return '{' + ','.join(escaped) + '}'
+    
+    def prometheus(self):
+        """Prometheus text exposition format (e.g. for the node_exporter textfile collector)"""
+        lines = []
+        with self._lock:
+            typed = set()
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                metric = f'{self.prefix}_{name}_seconds'
+                if metric not in typed:
+                    typed.add(metric)
+                    lines.append(f'# TYPE {metric} histogram')
+                cumulative = 0
+                for bound, hits in zip(self.BUCKETS, histogram['buckets']):
+                    cumulative += hits
+                    lines.append(f'{metric}_bucket{self.prometheus_labels(labels, le=bound)} {cumulative}')
+                lines.append(f'{metric}_bucket{self.prometheus_labels(labels, le="+Inf")} {histogram["count"]}')
+                lines.append(f'{metric}_sum{self.prometheus_labels(labels)} {histogram["sum"]:.6f}')
+                lines.append(f'{metric}_count{self.prometheus_labels(labels)} {histogram["count"]}')
+            for (name, labels), value in sorted(self.counters.items()):
+                metric = f'{self.prefix}_{name}_total'
+                if metric not in typed:
+                    typed.add(metric)
+                    lines.append(f'# TYPE {metric} counter')
+                lines.append(f'{metric}{self.prometheus_labels(labels)} {value}')
+        return '\n'.join(lines) + '\n'
+
+class HttpResponse:
+    """A fully read (possibly size-capped) HTTP response"""
+    
+    __slots__ = ('url', 'status_code', 'headers', 'content', 'truncated', 'wire_bytes')
+    
+    def __init__(self, url, status_code, headers, content, truncated=False, wire_bytes=0):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.truncated = truncated    # Body stopped at the size cap
+        self.wire_bytes = wire_bytes  # Bytes received before decompression
+    
+    def json(self):
+        return json.loads(self.content)
+
+
+class HostLimiter:
+    """Concurrency cap plus a token bucket (rate requests/second, bursts of up to burst) for one host"""
+    
+    def __init__(self, concurrency, rate, burst):
+        self.semaphore = threading.Semaphore(concurrency)
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def take(self):
+        """Block until a token is available"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+    
+    @contextmanager
+    def slot(self):
+        with self.semaphore:
+            self.take()
+            yield
+
+
+class HttpTransport:
+    """The one HTTP client for feeds, quotes and article pages
+    
+    Keep-alive connections pooled per host, only the content encodings urllib3 can decode
+    (brotli when installed), streamed reads with a size cap, per-host concurrency and token-bucket
+    rate limits, and a single retry/timeout policy.
+    """
+    
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    
+    def __init__(self, headers, metrics=None, timeout=20, connect_timeout=5, retries=2, backoff=0.5,
+                 max_bytes=8 * 1024 * 1024, concurrency=1, rate=1.25, burst=1):
+        self.headers = dict(headers)
+        self.metrics = metrics
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_bytes = max_bytes
+        self.default_limits = (concurrency, rate, burst)
+        self.host_limits = {}
+        self._limiters = {}
+        self._lock = threading.Lock()
+        self._session = None
+    
+    def configure_host(self, host, concurrency, rate, burst):
+        """Per-host override of the default concurrency / rate limits"""
+        self.host_limits[host.lower()] = (concurrency, rate, burst)
+    
+    def session(self):
+        """The pooled requests session, created on first use (keeps requests out of startup)"""
+        with self._lock:
+            if self._session is None:
+                per_host = max([self.default_limits[0]] + [limits[0] for limits in self.host_limits.values()])
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=64, pool_maxsize=per_host)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update(self.headers)
+                # Never advertise an encoding (e.g. br without the brotli package) that can't be decoded
+                session.headers['Accept-Encoding'] = urllib3.util.request.ACCEPT_ENCODING
+                self._session = session
+            return self._session
+    
+    def limiter(self, host):
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = self._limiters[host] = HostLimiter(*self.host_limits.get(host, self.default_limits))
+            return limiter
+    
+    def get(self, url, params=None, headers=None, max_bytes=None, timeout=None):
+        """GET with the shared policy; retries connection errors, timeouts and 429/5xx with backoff
+        
+        Returns an HttpResponse (the last one if retries ran out on a retryable status); raises the
+        last requests exception if every attempt failed to connect or read.
+        """
+        host = urlparse(url).netloc.lower()
+        limiter = self.limiter(host)
+        max_bytes = max_bytes or self.max_bytes
+        timeout = (self.connect_timeout, timeout or self.timeout)
+        
+        for attempt in range(self.retries + 1):
+            retry_after = None
+            try:
+                with limiter.slot():
+                    response = self.read(url, params, headers, max_bytes, timeout)
+                if response.status_code not in self.RETRY_STATUSES or attempt == self.retries:
+                    return response
+                retry_after = response.headers.get('Retry-After')
+                error = f"HTTP {response.status_code}"
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                if attempt == self.retries:
+                    raise
+                error = type(e).__name__
+            
+            delay = self.backoff * 2 ** attempt * (1 + random.random())
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, min(float(retry_after), 30.0))
+            if self.metrics:
+                self.metrics.count('http_retries', host=host)
+            print(f"🔁 Retrying {url} in {delay:.1f}s ({error})")
+            time.sleep(delay)
+    
+    def read(self, url, params, headers, max_bytes, timeout):
+        """One streamed request, stopping at max_bytes of decoded body"""
+        started = time.monotonic()
+        with self.session().get(url, params=params, headers=headers, timeout=timeout, stream=True) as response:
+            content = bytearray()
+            truncated = False
+            for chunk in response.iter_content(64 * 1024):
+                content += chunk
+                if len(content) >= max_bytes:
+                    truncated = True
+                    del content[max_bytes:]
+                    break
+                # The read timeout is per socket read; a slow drip must not hold the host slot forever
+                if time.monotonic() - started > 3 * timeout[1]:
+                    raise requests.Timeout(f"body of {url} not received within {3 * timeout[1]:.0f}s")
+            wire_bytes = response.raw.tell() or len(content)
+        
+        if self.metrics:
+            self.metrics.count('http_requests', host=urlparse(url).netloc.lower(), status=response.status_code)
+            if truncated:
+                self.metrics.count('http_truncated', host=urlparse(url).netloc.lower())
+        return HttpResponse(response.url, response.status_code, response.headers, bytes(content), truncated, wire_bytes)
+    
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+class FeedCache:
+    """Persistent conditional-GET cache for RSS feeds (ETag/Last-Modified plus last entries)"""
+    
+    # Only the entry fields the pipeline actually reads are kept
+    ENTRY_FIELDS = ('title', 'summary', 'link', 'published')
+    
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS feed_cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                modified TEXT,
+                entries TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS feed_routes (
+                source TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+    
+    def get(self, url):
+        """Return the cached validators and entries for a feed URL, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, modified, entries, fetched_at FROM feed_cache WHERE url = ?", (url,)
+            ).fetchone()
+        if not row:
+            return None
+        return {'etag': row[0], 'modified': row[1], 'entries': json.loads(row[2]), 'fetched_at': row[3]}
+    
+    def store(self, url, etag, modified, entries):
+        """Remember the validators and a compact copy of the parsed entries"""
+        compact = [
+            {field: entry.get(field) for field in self.ENTRY_FIELDS if entry.get(field) is not None}
+            for entry in entries
+        ]
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO feed_cache (url, etag, modified, entries, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (url, etag, modified, json.dumps(compact), time.time())
+            )
+            self._conn.commit()
+    
+    def get_route(self, source_name):
+        """URL that last served a healthy feed for this source, or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT url FROM feed_routes WHERE source = ?", (source_name,)).fetchone()
+        return row[0] if row else None
+    
+    def set_route(self, source_name, url):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO feed_routes (source, url, updated_at) VALUES (?, ?, ?)",
+                (source_name, url, time.time())
+            )
+            self._conn.commit()
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ArticleTextCache:
+    """Extracted lead text of article pages, cached by URL (empty text marks pages with nothing usable)"""
+    
+    def __init__(self, db_path, ttl_days=14):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS article_text (
+                url TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("DELETE FROM article_text WHERE fetched_at < ?", (time.time() - ttl_days * 86400,))
+        self._conn.commit()
+    
+    def get(self, url):
+        """Cached text for a URL ('' if the page had none), or None if never fetched"""
+        with self._lock:
+            row = self._conn.execute("SELECT text FROM article_text WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+    
+    def store(self, url, text):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO article_text (url, text, fetched_at) VALUES (?, ?, ?)",
+                (url, text, time.time())
+            )
+            self._conn.commit()
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class IssueArchive:
+    """Articles of every sent issue, with an FTS5 index for firm / category / date-range / text queries"""
+    
+    def __init__(self, db_path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS issues (
+                id INTEGER PRIMARY KEY,
+                issue_date TEXT NOT NULL,
+                variant TEXT NOT NULL,
+                subject TEXT,
+                sent_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS archived_articles (
+                id INTEGER PRIMARY KEY,
+                issue_id INTEGER NOT NULL REFERENCES issues (id),
+                issue_date TEXT NOT NULL,
+                category TEXT NOT NULL,
+                score REAL NOT NULL,
+                source TEXT NOT NULL,
+                title TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                body TEXT NOT NULL DEFAULT '',
+                link TEXT NOT NULL
+            );
+            -- A story carried by several issue variants on one day is archived once
+            CREATE UNIQUE INDEX IF NOT EXISTS archived_articles_story ON archived_articles (issue_date, link, title);
+            CREATE INDEX IF NOT EXISTS archived_articles_category ON archived_articles (category, issue_date);
+            CREATE TABLE IF NOT EXISTS archived_firms (
+                article_id INTEGER NOT NULL REFERENCES archived_articles (id),
+                firm TEXT NOT NULL,
+                issue_date TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS archived_firms_lookup ON archived_firms (firm, issue_date);
+        """)
+        try:
+            self._conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS archive_fts USING fts5(
+                    title, summary, body, content='archived_articles', content_rowid='id', tokenize='porter unicode61'
+                )
+            """)
+            self.full_text = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: text queries fall back to LIKE scans
+            self.full_text = False
+        self._conn.commit()
+    
+    def add_issue(self, variant, subject, articles, issue_date=None):
+        """Archive one sent issue; articles are (Article, firms) pairs. Returns the number of new rows"""
+        issue_date = issue_date or datetime.now().strftime('%Y-%m-%d')
+        added = 0
+        with self._lock:
+            issue_id = self._conn.execute(
+                "INSERT INTO issues (issue_date, variant, subject, sent_at) VALUES (?, ?, ?, ?)",
+                (issue_date, variant, subject, time.time())
+            ).lastrowid
+            for article, firms in articles:
+                cursor = self._conn.execute(
+                    """INSERT OR IGNORE INTO archived_articles
+                       (issue_id, issue_date, category, score, source, title, summary, body, link)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (issue_id, issue_date, article.category, article.score, article.source,
+                     article.title, article.summary, article.body, article.link)
+                )
+                if not cursor.rowcount:
+                    continue
+                added += 1
+                article_id = cursor.lastrowid
+                if self.full_text:
+                    self._conn.execute(
+                        "INSERT INTO archive_fts (rowid, title, summary, body) VALUES (?, ?, ?, ?)",
+                        (article_id, article.title, article.summary, article.body)
+                    )
+                self._conn.executemany(
+                    "INSERT INTO archived_firms (article_id, firm, issue_date) VALUES (?, ?, ?)",
+                    [(article_id, firm, issue_date) for firm in firms]
+                )
+            self._conn.commit()
+        return added
+    
+    @staticmethod
+    def match_expression(query=None, phrase=None):
+        """FTS5 query: every word of query, plus the words of phrase in order ('' if there is nothing to match)
+        
+        Everything is quoted, so '-' or ':' in the input is never FTS5 syntax.
+        """
+        terms = [f'"{word}"' for word in re.findall(r'\w+', query or '')]
+        phrase_words = re.findall(r'\w+', phrase or '')
+        if phrase_words:
+            terms.append('"' + ' '.join(phrase_words) + '"')
+        return ' '.join(terms)
+    
+    def search(self, query=None, firm=None, category=None, since=None, until=None, limit=50, phrase=None):
+        """Archived articles matching every given filter, newest first
+        
+        firm is a lowercase firm keyword; phrase is text that must appear as written (word order kept);
+        since/until are inclusive 'YYYY-MM-DD' dates.
+        """
+        sql = "SELECT a.issue_date, a.category, a.score, a.source, a.title, a.summary, a.link FROM archived_articles a"
+        where, params = [], []
+        order = "a.issue_date DESC, a.score DESC"
+        
+        expression = self.match_expression(query, phrase)
+        if not expression and ((query or '').strip() or (phrase or '').strip()):
+            # Text was given but none of it is searchable (e.g. '!!!'): no match, not the whole archive
+            return []
+        if expression and self.full_text:
+            sql += " JOIN archive_fts ON archive_fts.rowid = a.id"
+            where.append("archive_fts MATCH ?")
+            params.append(expression)
+            # Issues are archived as they are sent, so rowid order is date order; walking the
+            # index newest-first stops at the limit instead of ranking every match
+            order = "archive_fts.rowid DESC"
+        elif expression:
+            patterns = re.findall(r'\w+', query or '')
+            if phrase and re.findall(r'\w+', phrase):
+                patterns.append(' '.join(re.findall(r'\w+', phrase)))
+            for pattern in patterns:
+                where.append("(a.title || ' ' || a.summary || ' ' || a.body) LIKE ?")
+                params.append(f'%{pattern}%')
+        
+        if firm:
+            where.append("a.id IN (SELECT article_id FROM archived_firms WHERE firm = ?"
+                         + (" AND issue_date >= ?" if since else "") + (" AND issue_date <= ?" if until else "") + ")")
+            params += [firm] + ([since] if since else []) + ([until] if until else [])
+        if category:
+            where.append("a.category = ?")
+            params.append(category)
+        if since:
+            where.append("a.issue_date >= ?")
+            params.append(since)
+        if until:
+            where.append("a.issue_date <= ?")
+            params.append(until)
+        
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order} LIMIT ?"
+        params.append(limit)
+        
+        columns = ('issue_date', 'category', 'score', 'source', 'title', 'summary', 'link')
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class FeedHealthRegistry:
+    """Per-source feed health (latency, error rate, entry counts) with a circuit breaker"""
+    
+    COLUMNS = (
+        'source', 'attempts', 'successes', 'failures', 'consecutive_failures', 'latency_ewma',
+        'last_latency', 'last_entries', 'last_success', 'last_failure', 'last_error', 'open_until'
+    )
+    
+    def __init__(self, db_path, failure_threshold=3, base_backoff=6 * 3600, max_backoff=7 * 86400):
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS feed_health (
+                source TEXT PRIMARY KEY,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                successes INTEGER NOT NULL DEFAULT 0,
+                failures INTEGER NOT NULL DEFAULT 0,
+                consecutive_failures INTEGER NOT NULL DEFAULT 0,
+                latency_ewma REAL,
+                last_latency REAL,
+                last_entries INTEGER,
+                last_success REAL,
+                last_failure REAL,
+                last_error TEXT,
+                open_until REAL
+            )
+        """)
+        self._conn.commit()
+    
+    def get(self, source_name):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM feed_health WHERE source = ?", (source_name,)
+            ).fetchone()
+        return dict(zip(self.COLUMNS, row)) if row else None
+    
+    def is_open(self, source_name, now=None):
+        """True while the breaker is open; once it expires the next fetch is a probe"""
+        health = self.get(source_name)
+        if not health or not health['open_until']:
+            return False
+        return (now or time.time()) < health['open_until']
+    
+    def record(self, source_name, success, latency, entries=0, error=None):
+        """Record one fetch outcome and open/close the breaker accordingly"""
+        now = time.time()
+        health = self.get(source_name) or {column: None for column in self.COLUMNS}
+        attempts = (health['attempts'] or 0) + 1
+        successes = (health['successes'] or 0) + (1 if success else 0)
+        failures = (health['failures'] or 0) + (0 if success else 1)
+        consecutive = 0 if success else (health['consecutive_failures'] or 0) + 1
+        ewma = latency if health['latency_ewma'] is None else 0.3 * latency + 0.7 * health['latency_ewma']
+        
+        open_until = None
+        if consecutive >= self.failure_threshold:
+            # Exponential probe schedule: 6h, 12h, 24h ... capped at max_backoff
+            backoff = min(self.base_backoff * 2 ** (consecutive - self.failure_threshold), self.max_backoff)
+            open_until = now + backoff
+        
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO feed_health ({', '.join(self.COLUMNS)}) VALUES ({', '.join('?' * len(self.COLUMNS))})",
+                (
+                    source_name, attempts, successes, failures, consecutive, ewma, latency,
+                    entries if success else health['last_entries'],
+                    now if success else health['last_success'],
+                    health['last_failure'] if success else now,
+                    health['last_error'] if success else error,
+                    open_until
+                )
+            )
+            self._conn.commit()
+        return open_until
+    
+    def report(self):
+        """All sources, worst first, with derived error rate"""
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {', '.join(self.COLUMNS)} FROM feed_health").fetchall()
+        report = []
+        for row in rows:
+            health = dict(zip(self.COLUMNS, row))
+            health['error_rate'] = round(health['failures'] / health['attempts'], 3) if health['attempts'] else 0.0
+            health['circuit'] = 'open' if health['open_until'] and health['open_until'] > time.time() else 'closed'
+            report.append(health)
+        return sorted(report, key=lambda health: (-health['error_rate'], health['source']))
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class PriceHistoryStore:
+    """Per-symbol columnar store of daily closes, kept as memory-mapped .npy files"""
+    
+    DTYPE = np.dtype([('ts', '<i8'), ('close', '<f8')]) if np is not None else None
+    
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+    
+    def path(self, symbol):
+        safe_symbol = re.sub(r'[^A-Za-z0-9_.-]', '_', symbol)
+        return os.path.join(self.directory, f"{safe_symbol}.npy")
+    
+    def load(self, symbol):
+        """Memory-map the stored bars for a symbol (None if nothing stored yet)"""
+        try:
+            return np.load(self.path(symbol), mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+    
+    def last_timestamp(self, symbol):
+        history = self.load(symbol)
+        if history is None or len(history) == 0:
+            return None
+        return int(history['ts'][-1])
+    
+    def merge(self, symbol, timestamps, close_prices, keep_since):
+        """Append freshly fetched bars (replacing any overlap) and drop bars older than keep_since"""
+        new_bars = np.empty(len(timestamps), dtype=self.DTYPE)
+        new_bars['ts'] = timestamps
+        new_bars['close'] = [np.nan if price is None else price for price in close_prices]
+        
+        history = self.load(symbol)
+        if history is not None and len(history):
+            # Copy out of the memory map before the file is replaced
+            cutoff = new_bars['ts'][0] if len(new_bars) else np.iinfo(np.int64).max
+            kept = np.array(history[history['ts'] < cutoff])
+            del history
+            new_bars = np.concatenate([kept, new_bars])
+        
+        new_bars = new_bars[new_bars['ts'] >= keep_since]
+        
+        tmp_path = self.path(symbol) + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.save(f, new_bars)
+        os.replace(tmp_path, self.path(symbol))
+
+
+class KeywordMatcher:
+    """Single-pass multi-keyword matcher: one prefix-factored regex with word boundaries"""
+    
+    # Keywords must start on a word boundary and may end with a plural suffix ("deal" -> "deals")
+    WORD_CHAR = re.compile(r'\w')
+    SUFFIX = r'(?:e?s)?(?!\w)'
+    # Bump whenever the pattern building or the artifact / term-bit layout changes (invalidates cached lexicons)
+    FORMAT_VERSION = 2
+    
+    def __init__(self, groups):
+        # term -> labels of every group that lists it
+        self.labels_by_term = {}
+        for label, keywords in groups.items():
+            for keyword in keywords:
+                self.labels_by_term.setdefault(keyword.lower(), set()).add(label)
+        
+        word_trie, symbol_trie = {}, {}
+        for term in self.labels_by_term:
+            node = word_trie if self.is_word_char(term[0]) else symbol_trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[''] = term
+        
+        # Shorter keywords nested inside a longer one ("tpg" in "tpg real estate") count as hits too
+        self.implied = {}
+        for term in self.labels_by_term:
+            nested = self.scan_trie(term, word_trie, symbol_trie)
+            if nested != {term}:
+                self.implied[term] = nested
+        self.index_terms()
+        
+        # Lookahead capture so overlapping keywords are all reported in one scan
+        branches = []
+        if word_trie:
+            branches.append(r'(?<!\w)' + self.trie_pattern(word_trie))
+        if symbol_trie:
+            branches.append(self.trie_pattern(symbol_trie))
+        self.pattern = re.compile('(?=(' + '|'.join(branches) + '))') if branches else None
+    
+    def to_artifact(self):
+        """Serializable form of the built matcher (tries and nested-term scan already done)"""
+        return {
+            'labels_by_term': {term: sorted(labels) for term, labels in self.labels_by_term.items()},
+            'implied': {term: sorted(nested) for term, nested in self.implied.items()},
+            'pattern': self.pattern.pattern if self.pattern else None
+        }
+    
+    @classmethod
+    def from_artifact(cls, artifact):
+        matcher = cls.__new__(cls)
+        matcher.labels_by_term = {term: set(labels) for term, labels in artifact['labels_by_term'].items()}
+        matcher.implied = {term: set(nested) for term, nested in artifact['implied'].items()}
+        matcher.pattern = re.compile(artifact['pattern']) if artifact['pattern'] else None
+        matcher.index_terms()
+        return matcher
+    
+    def index_terms(self):
+        """Give every term a bit: term_bits folds in nested terms, label_masks covers a label's terms"""
+        self.term_list = list(self.labels_by_term)
+        bit_of = {term: 1 << position for position, term in enumerate(self.term_list)}
+        self.term_bits = {}
+        self.label_masks = {}
+        for term, labels in self.labels_by_term.items():
+            bits = bit_of[term]
+            for nested in self.implied.get(term, ()):
+                bits |= bit_of[nested]
+            self.term_bits[term] = bits
+            for label in labels:
+                self.label_masks[label] = self.label_masks.get(label, 0) | bit_of[term]
+    
+    @classmethod
+    def is_word_char(cls, char):
+        return bool(cls.WORD_CHAR.match(char))
+    
+    @classmethod
+    def trie_pattern(cls, node, last_char=''):
+        """Compile a trie into a regex so shared prefixes are only tested once"""
+        branches = [
+            re.escape(char) + cls.trie_pattern(child, char)
+            for char, child in sorted(node.items()) if char
+        ]
+        if '' in node:
+            # Longer keywords are tried first, then this one ends here
+            branches.append(cls.SUFFIX if cls.is_word_char(last_char) else '')
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+    
+    @classmethod
+    def scan_trie(cls, text, word_trie, symbol_trie):
+        """Find every keyword inside text by walking the tries (used once per keyword at build time)"""
+        found = set()
+        for start in range(len(text)):
+            for trie in (word_trie, symbol_trie):
+                if trie is word_trie and start > 0 and cls.is_word_char(text[start - 1]):
+                    continue
+                node = trie
+                for end in range(start, len(text)):
+                    node = node.get(text[end])
+                    if node is None:
+                        break
+                    term = node.get('')
+                    if term is None:
+                        continue
+                    rest = text[end + 1:]
+                    if not cls.is_word_char(term[-1]) or re.match(cls.SUFFIX, rest):
+                        found.add(term)
+        return found
+    
+    def lookup(self, matched):
+        """Map matched text (possibly with a plural suffix) back to its keyword"""
+        if matched in self.labels_by_term:
+            return matched
+        for suffix in ('s', 'es'):
+            if matched.endswith(suffix) and matched[:-len(suffix)] in self.labels_by_term:
+                return matched[:-len(suffix)]
+        return None
+    
+    def matched_terms(self, hits, label):
+        """Keywords of one label that are set in hits"""
+        bits = hits.bits & self.label_masks.get(label, 0)
+        return [self.term_list[position] for position in range(bits.bit_length()) if bits >> position & 1]
+    
+    def match(self, text_lower):
+        """Return the KeywordHits (a bitset of matched terms) for the lowercased text"""
+        bits = 0
+        if self.pattern is not None:
+            for found in self.pattern.finditer(text_lower):
+                term = self.lookup(found.group(1))
+                if term is not None:
+                    bits |= self.term_bits[term]
+        return KeywordHits(bits, self.label_masks)
+
+
+class KeywordHits:
+    """Matched keywords as one int bitset; 'label in hits' and hits.count(label) test it against label masks"""
+    
+    __slots__ = ('bits', 'label_masks')
+    
+    def __init__(self, bits, label_masks):
+        self.bits = bits
+        self.label_masks = label_masks
+    
+    def __contains__(self, label):
+        return bool(self.bits & self.label_masks.get(label, 0))
+    
+    def count(self, label):
+        """Number of distinct keywords of a label that matched"""
+        return (self.bits & self.label_masks.get(label, 0)).bit_count()
+
+
+class Article:
+    """One candidate story; the lowercased text, keyword hits, features, score and category are computed once"""
+    
+    __slots__ = (
+        'title', 'summary', 'link', 'source', 'published', 'priority', 'seen_keys', 'duplicate_keys', 'text', 'body',
+        'keyword_hits', 'features', 'score', 'category', 'superseded', 'supersedes', 'pooled_at', 'alerted'
+    )
+    
+    def __init__(self, title, summary, link='', source='', published='Recent', priority=5, seen_keys=None):
+        self.title = title
+        self.summary = summary
+        self.link = link
+        self.source = source
+        self.published = published
+        self.priority = priority
+        self.seen_keys = seen_keys
+        self.duplicate_keys = ()  # seen_keys of the near-duplicate copies this article stands for
+        self.text = (title + ' ' + summary).lower()  # Shared by matching, categorization and dedup
+        self.body = ''  # Lead paragraphs from the article page (enrichment stage)
+        self.keyword_hits = None
+        self.features = None
+        self.score = 0.0
+        self.category = None
+        self.superseded = False
+        self.supersedes = None  # The earlier copy of this story that this one replaced
+        self.pooled_at = None
+        self.alerted = False
+    
+    def enrich(self, body):
+        """Add page text; the lowercased text (and so keyword matching) then covers it too"""
+        self.body = body
+        self.text = (self.title + ' ' + self.summary + ' ' + body).lower()
+    
+    def copy(self):
+        duplicate = Article.__new__(Article)
+        for name in self.__slots__:
+            setattr(duplicate, name, getattr(self, name))
+        return duplicate
+
+
+class SeenArticleIndex:
+    """Persistent index of already-mailed stories (canonical link + content hash) with TTL eviction"""
+    
+    TRACKING_PARAM = re.compile(r'^(utm_\w+|fbclid|gclid|mc_cid|mc_eid|cmpid|ref|src|mod)$', re.IGNORECASE)
+    
+    def __init__(self, db_path, ttl_days=7):
+        self.ttl_seconds = ttl_days * 86400
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen_articles (
+                key TEXT PRIMARY KEY,
+                seen_at REAL NOT NULL
+            )
+        """)
+        self.evict()
+        # The live key set is small (days of stories), so membership checks stay in memory
+        self.keys = {row[0] for row in self._conn.execute("SELECT key FROM seen_articles")}
+    
+    @classmethod
+    def canonical_link(cls, link):
+        """Normalize a link: lowercase host, no www., no tracking params, fragment or trailing slash"""
+        parts = urlparse(link.strip())
+        host = parts.netloc.lower()
+        if host.startswith('www.'):
+            host = host[4:]
+        query = urlencode(sorted(
+            (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not cls.TRACKING_PARAM.match(key)
+        ))
+        return urlunparse(('', host, parts.path.rstrip('/'), '', query, ''))
+    
+    @staticmethod
+    def content_hash(title, summary):
+        """Hash of the raw title + summary with case and whitespace normalized"""
+        text = ' '.join(f"{title} {summary}".lower().split())
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+    
+    @classmethod
+    def keys_for(cls, link, title, summary):
+        keys = ['hash:' + cls.content_hash(title, summary)]
+        if link:
+            keys.append('link:' + cls.canonical_link(link))
+        return keys
+    
+    def is_seen(self, keys):
+        return any(key in self.keys for key in keys)
+    
+    def mark_seen(self, keys):
+        """Record keys as mailed (refreshing their TTL)"""
+        now = time.time()
+        keys = list(keys)
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO seen_articles (key, seen_at) VALUES (?, ?)",
+                [(key, now) for key in keys]
+            )
+            self._conn.commit()
+            self.keys.update(keys)
+    
+    def evict(self):
+        """Drop entries older than the TTL"""
+        with self._lock:
+            self._conn.execute("DELETE FROM seen_articles WHERE seen_at < ?", (time.time() - self.ttl_seconds,))
+            self._conn.commit()
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class NearDuplicateIndex:
+    """MinHash signatures with LSH banding, for clustering near-duplicate stories in ~linear time"""
+    
+    PRIME = (1 << 31) - 1  # Keeps a * x + b inside uint64 for the NumPy path
+    
+    def __init__(self, num_perm=64, bands=16, threshold=0.5, seed=42):
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        rng = random.Random(seed)
+        self.a = [rng.randrange(1, self.PRIME) for _ in range(num_perm)]
+        self.b = [rng.randrange(0, self.PRIME) for _ in range(num_perm)]
+        if np is not None:
+            self.a_array = np.array(self.a, dtype=np.uint64)[:, None]
+            self.b_array = np.array(self.b, dtype=np.uint64)[:, None]
+        self.buckets = [{} for _ in range(bands)]
+        self.signatures = {}
+    
+    def shingles(self, text):
+        """Word bigrams of the normalized text (single words for very short texts)"""
+        words = re.findall(r'\w+', text.lower())
+        if len(words) < 2:
+            return set(words)
+        return {f"{first} {second}" for first, second in zip(words, words[1:])}
+    
+    def signature(self, text):
+        """MinHash signature of a text as a tuple of num_perm ints"""
+        hashes = [zlib.crc32(shingle.encode('utf-8')) % self.PRIME for shingle in self.shingles(text)]
+        if not hashes:
+            return (self.PRIME,) * self.num_perm
+        
+        if np is not None:
+            x = np.array(hashes, dtype=np.uint64)[None, :]
+            return tuple(((self.a_array * x + self.b_array) % self.PRIME).min(axis=1).tolist())
+        
+        return tuple(min((a * x + b) % self.PRIME for x in hashes) for a, b in zip(self.a, self.b))
+    
+    def band_keys(self, signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+    
+    def similarity(self, first, second):
+        """Estimated Jaccard similarity of two signatures"""
+        return sum(1 for x, y in zip(first, second) if x == y) / self.num_perm
+    
+    def find(self, signature):
+        """Return the key of the most similar indexed item above the threshold, or None"""
+        candidates = set()
+        for band, band_key in self.band_keys(signature):
+            candidates.update(self.buckets[band].get(band_key, ()))
+        
+        best_key, best_similarity = None, self.threshold
+        for key in candidates:
+            similarity = self.similarity(signature, self.signatures[key])
+            if similarity >= best_similarity:
+                best_key, best_similarity = key, similarity
+        return best_key
+    
+    def add(self, key, signature):
+        """Index the one representative signature of a cluster
+        
+        Members are matched against it alone, so clusters cannot drift through chains of
+        pairwise-similar stories and a lookup costs the same however large a cluster grows.
+        """
+        self.signatures[key] = signature
+        for band, band_key in self.band_keys(signature):
+            self.buckets[band].setdefault(band_key, []).append(key)
+
+
+class WarmArticlePool:
+    """Scored, deduplicated articles kept in memory between daemon polls"""
+    
+    def __init__(self, max_age_hours=36):
+        self.max_age = max_age_hours * 3600
+        self.articles = []
+        self.known = set()          # Entry keys already processed today (kept or filtered out)
+        self.dedup_index = NearDuplicateIndex()
+        self.representatives = {}   # Dedup cluster -> article, shared across polls
+    
+    @staticmethod
+    def entry_keys(entry):
+        return entry.get('seen_keys') or ['link:' + (entry.get('link') or entry.get('title', ''))]
+    
+    @staticmethod
+    def article_keys(article):
+        return article.seen_keys or ['link:' + (article.link or article.title)]
+    
+    def is_known(self, entry):
+        return any(key in self.known for key in self.entry_keys(entry))
+    
+    def remember(self, entry):
+        self.known.update(self.entry_keys(entry))
+    
+    def add(self, article):
+        article.pooled_at = time.time()
+        self.articles.append(article)
+    
+    def candidates(self):
+        """Live articles in arrival order (arrival order breaks score ties)"""
+        return [article for article in self.articles if not article.superseded]
+    
+    def reset(self, sent_keys=()):
+        """Drop sent, superseded and stale articles; returns the survivors to be re-indexed"""
+        sent_keys = set(sent_keys)
+        cutoff = time.time() - self.max_age
+        survivors = [
+            article for article in self.candidates()
+            if article.pooled_at >= cutoff and not sent_keys.intersection(self.article_keys(article))
+        ]
+        self.articles = []
+        self.known = set()
+        self.dedup_index = NearDuplicateIndex()
+        self.representatives = {}
+        return survivors
+
+
+class SmtpDelivery:
+    """Batch SMTP delivery: sticky endpoint, one authenticated connection per worker, per-recipient retries"""
+    
+    def __init__(self, username, password, endpoints, state_path=None, concurrency=2, timeout=30, max_attempts=3):
+        self.username = username
+        self.password = password
+        self.endpoints = [tuple(endpoint) for endpoint in endpoints]
+        self.state_path = state_path
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self.preferred = self.load_preferred()
+    
+    def load_preferred(self):
+        """Endpoint that worked last time (persisted between runs)"""
+        try:
+            with open(self.state_path) as f:
+                endpoint = tuple(json.load(f)['endpoint'])
+            return endpoint if endpoint in self.endpoints else None
+        except (TypeError, OSError, ValueError, KeyError):
+            return None
+    
+    def remember(self, endpoint):
+        with self._lock:
+            if endpoint == self.preferred:
+                return
+            self.preferred = endpoint
+            if self.state_path:
+                try:
+                    with open(self.state_path, 'w') as f:
+                        json.dump({'endpoint': list(endpoint)}, f)
+                except OSError as e:
+                    print(f"⚠️ Could not save SMTP endpoint: {e}")
+    
+    def ordered_endpoints(self):
+        if self.preferred is None:
+            return list(self.endpoints)
+        return [self.preferred] + [endpoint for endpoint in self.endpoints if endpoint != self.preferred]
+    
+    def connect(self):
+        """Open and authenticate a connection, trying the last good endpoint first"""
+        for endpoint in self.ordered_endpoints():
+            server, port, mode = endpoint
+            smtp_server = None
+            try:
+                print(f"🔄 Trying SMTP: {server}:{port} ({mode})")
+                if mode == 'ssl':
+                    smtp_server = smtplib.SMTP_SSL(server, port, timeout=self.timeout)
+                else:
+                    smtp_server = smtplib.SMTP(server, port, timeout=self.timeout)
+                    if mode == 'starttls':
+                        smtp_server.starttls()
+                # Relays without credentials (e.g. a local MTA) are used unauthenticated
+                if self.username and self.password:
+                    smtp_server.login(self.username, self.password)
+                self.remember(endpoint)
+                return smtp_server
+            
+            except (smtplib.SMTPException, OSError) as e:
+                print(f"❌ SMTP error on {server}:{port}: {e}")
+                # Don't leak the socket of a half-set-up connection (e.g. failed STARTTLS or login)
+                if smtp_server is not None:
+                    try:
+                        smtp_server.quit()
+                    except (smtplib.SMTPException, OSError):
+                        smtp_server.close()
+        
+        raise smtplib.SMTPException("No SMTP endpoint accepted the connection")
+    
+    def deliver_share(self, share):
+        """Send a share of the batch over one connection; returns (failed, rejected): retryable and permanent failures"""
+        failed, rejected = [], []
+        smtp_server = None
+        try:
+            for position, (recipient, message) in enumerate(share):
+                if smtp_server is None:
+                    try:
+                        smtp_server = self.connect()
+                    except smtplib.SMTPException as e:
+                        # Every endpoint was just tried; leave the rest of the share to send_batch's backoff
+                        print(f"❌ {e}, deferring {len(share) - position} recipient(s)")
+                        failed.extend(share[position:])
+                        break
+                try:
+                    smtp_server.send_message(message, to_addrs=[recipient])
+                except smtplib.SMTPServerDisconnected as e:
+                    print(f"❌ Connection lost while sending to {recipient}: {e}")
+                    failed.append((recipient, message))
+                    smtp_server = None
+                except smtplib.SMTPRecipientsRefused as e:
+                    # 5xx is a permanent refusal (unknown mailbox etc.); only 4xx is worth another attempt
+                    permanent = all(code >= 500 for code, _ in e.recipients.values())
+                    print(f"❌ {recipient} refused{' permanently' if permanent else ''}: {e.recipients}")
+                    (rejected if permanent else failed).append((recipient, message))
+                except smtplib.SMTPResponseException as e:
+                    print(f"❌ Delivery to {recipient} failed: {e.smtp_code} {e.smtp_error!r}")
+                    (rejected if e.smtp_code >= 500 else failed).append((recipient, message))
+                except smtplib.SMTPException as e:
+                    # Rejected message; smtplib has already reset the session, keep using it
+                    print(f"❌ Delivery to {recipient} failed: {e}")
+                    failed.append((recipient, message))
+                except OSError as e:
+                    print(f"❌ Network error while sending to {recipient}: {e}")
+                    failed.append((recipient, message))
+                    self.close_quietly(smtp_server)
+                    smtp_server = None
+        finally:
+            self.close_quietly(smtp_server)
+        return failed, rejected
+    
+    @staticmethod
+    def close_quietly(smtp_server):
+        if smtp_server is None:
+            return
+        try:
+            smtp_server.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+    
+    def send_batch(self, messages):
+        """Deliver (recipient, message) pairs with bounded concurrency, retrying only failures"""
+        pending, rejected = list(messages), []
+        for attempt in range(1, self.max_attempts + 1):
+            if not pending:
+                break
+            if attempt > 1:
+                print(f"🔁 Retrying {len(pending)} recipient(s) (attempt {attempt}/{self.max_attempts})")
+                time.sleep(2 ** (attempt - 1))
+            
+            workers = min(self.concurrency, len(pending))
+            shares = [pending[i::workers] for i in range(workers)]
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='smtp') as executor:
+                results = list(executor.map(self.deliver_share, shares))
+            pending = [item for failed, _ in results for item in failed]
+            rejected += [item for _, refused in results for item in refused]
+        
+        return [recipient for recipient, _ in pending + rejected]
+
+
+# ----------------------------------------------------------------------
+# Newsletter layout, precompiled once into static fragments and {{slots}}
+# ----------------------------------------------------------------------
+
+class HtmlTemplate:
+    """A layout fragment split once into static text and named {{slot}} markers"""
+    
+    SLOT = re.compile(r'\{\{(\w+)\}\}')
+    
+    def __init__(self, source):
+        # Even indexes are static text, odd indexes are slot names
+        self.parts = self.SLOT.split(source)
+    
+    def render_into(self, out, **values):
+        """Append the fragment to an output buffer (a list), filling in the slots"""
+        parts = self.parts
+        out.append(parts[0])
+        for i in range(1, len(parts), 2):
+            out.append(values[parts[i]])
+            out.append(parts[i + 1])
+
+
+NEWSLETTER_HEAD = HtmlTemplate("""
+        <html>
+        <head>
+            <style>
+                body { 
+                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+                    max-width: 680px; 
+                    margin: 0 auto; 
+                    background: #ffffff;
+                    color: #333;
+                    line-height: 1.6;
+                }
+                .header {
+                    text-align: center;
+                    padding: 30px 20px;
+                    border-bottom: 1px solid #e1e8ed;
+                }
+                .header h1 {
+                    font-size: 28px;
+                    color: #1a1a1a;
+                    margin: 0 0 10px 0;
+                    font-weight: 700;
+                }
+                .date {
+                    color: #657786;
+                    font-size: 14px;
+                }
+                .greeting {
+                    padding: 20px;
+                    background: #f8f9fa;
+                    margin: 0;
+                    font-size: 16px;
+                }
+                .section {
+                    margin: 30px 20px;
+                }
+                .section h2 {
+                    color: #1a1a1a;
+                    font-size: 20px;
+                    margin: 0 0 20px 0;
+                    font-weight: 600;
+                    border-bottom: 2px solid #1d9bf0;
+                    padding-bottom: 8px;
+                }
+                .article {
+                    margin-bottom: 20px;
+                    padding-bottom: 15px;
+                    border-bottom: 1px solid #f1f3f4;
+                }
+                .article:last-child {
+                    border-bottom: none;
+                }
+                .article-title {
+                    font-weight: 600;
+                    font-size: 16px;
+                    margin: 0 0 8px 0;
+                    color: #1a1a1a;
+                }
+                .article-summary {
+                    color: #536471;
+                    margin: 8px 0 12px 0;
+                    font-size: 14px;
+                }
+                .article-meta {
+                    font-size: 12px;
+                    color: #8b98a5;
+                    display: flex;
+                    justify-content: space-between;
+                    align-items: center;
+                }
+                .read-more {
+                    color: #1d9bf0;
+                    text-decoration: none;
+                    font-weight: 500;
+                    font-size: 13px;
+                }
+                .read-more:hover {
+                    text-decoration: underline;
+                }
+                .bullet-list {
+                    list-style-type: none;
+                    padding: 0;
+                    margin: 0;
+                }
+                .bullet-list li {
+                    margin-bottom: 15px;
+                    padding-left: 20px;
+                    position: relative;
+                    font-size: 15px;
+                    line-height: 1.5;
+                }
+                .bullet-list li:before {
+                    content: "•";
+                    position: absolute;
+                    left: 0;
+                    font-weight: bold;
+                    font-size: 18px;
+                }
+                .bullet-list a {
+                    color: #1d9bf0;
+                    text-decoration: none;
+                    font-size: 13px;
+                    font-weight: 500;
+                }
+                .bullet-list a:hover {
+                    text-decoration: underline;
+                }
+                .footer {
+                    text-align: center;
+                    padding: 30px 20px;
+                    border-top: 1px solid #e1e8ed;
+                    color: #8b98a5;
+                    font-size: 12px;
+                }
+                .category-divider {
+                    margin: 40px 0 30px 0;
+                    text-align: center;
+                }
+                .category-divider::before {
+                    content: '';
+                    display: inline-block;
+                    width: 50px;
+                    height: 1px;
+                    background: #e1e8ed;
+                    margin-right: 15px;
+                    vertical-align: middle;
+                }
+                .category-divider::after {
+                    content: '';
+                    display: inline-block;
+                    width: 50px;
+                    height: 1px;
+                    background: #e1e8ed;
+                    margin-left: 15px;
+                    vertical-align: middle;
+                }
+            </style>
+        </head>
+        <body>
+            <div class="header">
+                <h1>📡 ScopeSignal by ScopeLP</h1>
+                <div class="date">{{date}}</div>
+            </div>
+            
+""")
+
+NEWSLETTER_GREETING = HtmlTemplate("""
+            <div class="greeting">
+                <strong>Good Morning,</strong><br><br>
+                Today's brief covers {{total_articles}} key stories across global markets and private capital deals. 
+                Market data reflects closing prices from the most recent trading session.
+            </div>
+            
+""")
+
+SECTION_OPEN = HtmlTemplate("""
+                    <div class="section">
+                        <h2>{{emoji}} {{category}}</h2>
+""")
+
+SECTION_DESCRIPTION = HtmlTemplate("""
+                        <p style="color: #666; font-size: 14px; margin: 0 0 20px 0; font-style: italic;">{{description}}</p>
+""")
+
+BREAKING_ALERT_OPEN = HtmlTemplate("""
+                    <div class="section">
+                        <h2>🚨 Breaking: {{category}}</h2>
+""")
+
+ARTICLE_CARD = HtmlTemplate("""
+                        <div class="article">
+                            <div class="article-title">{{title}}</div>
+                            <div class="article-summary">{{summary}}</div>
+                            <div class="article-meta">
+                                <span>📍 {{source}}</span>
+                                <a href="{{link}}" class="read-more" target="_blank">Read more →</a>
+                            </div>
+                        </div>
+""")
+
+BULLET_ITEM = HtmlTemplate("""
+                        <li>
+                            {{title}} 
+                            <a href="{{link}}" target="_blank">[{{source}}]</a>
+                        </li>
+""")
+
+CATEGORY_DIVIDER = '<div class="category-divider"></div>'
+
+NEWSLETTER_FOOTER = """
+            <div class="footer">
+                <p>📊 ScopeSignal by ScopeLP - Private Equity Intelligence<br>
+                Automated monitoring and analysis for PE professionals.</p>
+            </div>
+        </body>
+        </html>
+        """
+
+
+def xml_local_name(tag):
+    """'{namespace}item' -> 'item'"""
+    return tag.rpartition('}')[2]
+
+
+def xml_inner_text(element):
+    """Text of an element, with any child markup (Atom type="xhtml") serialized back to HTML"""
+    if not len(element):
+        return element.text or ''
+    return (element.text or '') + ''.join(
+        etree.tostring(child, encoding='unicode', with_tail=True) for child in element
+    )
+
+
+def feed_entry_fields(element):
+    """The fields the pipeline reads from one RSS <item> or Atom <entry>"""
+    fields, content = {}, None
+    for child in element:
+        if not isinstance(child.tag, str):
+            continue  # Comments, processing instructions and unresolved entities
+        name = xml_local_name(child.tag)
+        if name == 'title':
+            fields.setdefault('title', (child.text or '').strip())
+        elif name == 'link':
+            href = child.get('href')
+            if href is None:
+                fields.setdefault('link', (child.text or '').strip())
+            elif child.get('rel', 'alternate') == 'alternate':
+                fields.setdefault('link', href.strip())
+        elif name in ('description', 'summary'):
+            fields.setdefault('summary', xml_inner_text(child))
+        elif name in ('encoded', 'content'):
+            content = content or xml_inner_text(child)
+        elif name in ('pubDate', 'published'):
+            fields.setdefault('published', (child.text or '').strip())
+    if 'summary' not in fields and content:
+        fields['summary'] = content
+    return fields
+
+
+def iter_feed_entries(source, limit=None):
+    """Yield entry dicts from an RSS 2.0/1.0 or Atom document while it is parsed, stopping after limit
+    
+    Each entry is cleared (with everything before it) once read, so memory stays flat however long the
+    feed is. Raises ValueError for a document that is not a feed, lxml's XMLSyntaxError for malformed XML.
+    """
+    context = etree.iterparse(
+        source, events=('end',), tag=('{*}item', '{*}entry'),
+        resolve_entities=False, no_network=True, remove_comments=True, remove_pis=True
+    )
+    for count, (_, element) in enumerate(context, 1):
+        if count == 1 and xml_local_name(element.getroottree().getroot().tag) not in ('rss', 'RDF', 'feed'):
+            raise ValueError(f"not an RSS/Atom document: <{element.getroottree().getroot().tag}>")
+        yield feed_entry_fields(element)
+        element.clear()
+        parent = element.getparent()
+        while element.getprevious() is not None:
+            del parent[0]
+        if limit and count >= limit:
+            return
+
+
+def parse_feed_bytes(content, response_headers, limit, fast=True):
+    """Parse a downloaded feed: the streaming lxml fast path, or feedparser if it is off or the feed is malformed
+    
+    Returns a FeedParserDict whose 'parser' key says which one produced the entries.
+    """
+    if fast:
+        try:
+            entries = [
+                feedparser.FeedParserDict(fields)
+                for fields in iter_feed_entries(io.BytesIO(content), limit)
+            ]
+            return feedparser.FeedParserDict(entries=entries, parser='lxml')
+        except (etree.XMLSyntaxError, ValueError):
+            pass  # Malformed or unusual markup: feedparser's lenient parser copes with it
+    feed = feedparser.parse(content, response_headers=response_headers)
+    feed['parser'] = 'feedparser'
+    return feed
+
+
+# Per-process state of a feed parsing worker (set once by the pool initializer)
+PARSE_WORKER = {}
+
+
+def init_parse_worker(matcher_artifact, specialized_sources, major_sources, entries_per_feed, fast_parser,
+                      seen_db=None, seen_ttl_seconds=0):
+    """Pool initializer: rebuild the keyword matcher once per worker process
+    
+    seen_db is the seen-article index database, opened read-only so entries can be checked before cleaning.
+    """
+    PARSE_WORKER['matcher'] = KeywordMatcher.from_artifact(matcher_artifact)
+    PARSE_WORKER['specialized_sources'] = frozenset(specialized_sources)
+    PARSE_WORKER['major_sources'] = frozenset(major_sources)
+    PARSE_WORKER['entries_per_feed'] = entries_per_feed
+    PARSE_WORKER['fast_parser'] = fast_parser
+    PARSE_WORKER['seen_ttl_seconds'] = seen_ttl_seconds
+    PARSE_WORKER['seen_db'] = None
+    if seen_db:
+        try:
+            PARSE_WORKER['seen_db'] = sqlite3.connect(f"file:{seen_db}?mode=ro", uri=True, timeout=30)
+        except sqlite3.Error as e:
+            print(f"⚠️ Parse worker can't read the seen-article index, the parent will check: {e}")
+
+
+def worker_seen_keys(keys):
+    """The given keys that the seen-article index holds (queried live, so a long-lived pool sees new sends)"""
+    placeholders = ','.join('?' * len(keys))
+    try:
+        rows = PARSE_WORKER['seen_db'].execute(
+            f"SELECT key FROM seen_articles WHERE key IN ({placeholders}) AND seen_at >= ?",
+            [*keys, time.time() - PARSE_WORKER['seen_ttl_seconds']]
+        )
+        return {row[0] for row in rows}
+    except sqlite3.Error:
+        return set()
+
+
+def parse_feed_document(source_name, content, response_headers):
+    """Parse, drop already-sent stories, then clean and pre-filter one feed document in a worker process
+    
+    Returns (total entries, kept entries, already-sent count, parser error, parser name, seconds); each kept
+    entry is a compact (title, link, published, summary, clean summary, keyword bits, seen keys) tuple, so
+    only the strings the pipeline needs cross the process boundary.
+    """
+    started = time.perf_counter()
+    matcher = PARSE_WORKER['matcher']
+    feed = parse_feed_bytes(content, response_headers, PARSE_WORKER['entries_per_feed'], PARSE_WORKER['fast_parser'])
+    
+    entries = [entry for entry in feed.entries[:PARSE_WORKER['entries_per_feed']] if entry.get('title')]
+    seen_keys, seen = [None] * len(entries), set()
+    if PARSE_WORKER['seen_db'] is not None and entries:
+        # Same check as stream_entries, on the raw entry, so sent stories are never cleaned or matched
+        seen_keys = [
+            SeenArticleIndex.keys_for(entry.get('link'), entry.title, entry.get('summary', '')) for entry in entries
+        ]
+        seen = worker_seen_keys([key for keys in seen_keys for key in keys])
+    
+    kept, already_seen = [], 0
+    for entry, keys in zip(entries, seen_keys):
+        if keys and seen.intersection(keys):
+            already_seen += 1
+            continue
+        title = entry.title
+        summary = entry.get('summary', title)
+        clean = FinancialNewsletterBot.clean_summary(summary)
+        hits = matcher.match((title + ' ' + clean).lower())
+        if source_name not in PARSE_WORKER['specialized_sources']:
+            if not FinancialNewsletterBot.keyword_relevance(hits, source_name in PARSE_WORKER['major_sources']):
+                continue
+        kept.append((title, entry.get('link', ''), entry.get('published', 'Recent'), summary, clean, hits.bits, keys))
+    
+    error = str(feed.get('bozo_exception')) if feed.get('bozo') and not feed.entries else None
+    return len(feed.entries), kept, already_seen, error, feed.parser, time.perf_counter() - started
+
 
 class FinancialNewsletterBot:
     def __init__(self):
+        # Instrumentation: per-stage spans/counters; NEWSBRIEF_DEBUG=1 turns on per-article debug output
+        self.metrics = RunMetrics()
+        self.debug = os.getenv('NEWSBRIEF_DEBUG', '').lower() in ('1', 'true', 'yes')
+        
         # Email configuration
         self.sender_email = os.getenv('SENDER_EMAIL')
         self.sender_password = os.getenv('EMAIL_PASSWORD')
         self.recipient_email = os.getenv('RECIPIENT_EMAIL')
+        # RECIPIENT_EMAIL may hold a comma-separated distribution list
+        self.recipients = [address.strip() for address in (self.recipient_email or '').split(',') if address.strip()]
+        
+        # SMTP endpoints, tried in order (the last one that worked is remembered and tried first).
+        # SMTP_SERVER=host:port[:starttls|ssl|plain] overrides them, e.g. for a local debug server
+        self.smtp_endpoints = [
+            ('mail.privateemail.com', 587, 'starttls'),
+            ('mail.privateemail.com', 465, 'ssl'),
+            ('smtp.privateemail.com', 587, 'starttls'),
+            ('smtp.privateemail.com', 465, 'ssl'),
+        ]
+        if os.getenv('SMTP_SERVER'):
+            host, port, *mode = os.getenv('SMTP_SERVER').split(':')
+            self.smtp_endpoints = [(host, int(port), mode[0] if mode else 'starttls')]
+        self.smtp_concurrency = int(os.getenv('SMTP_CONCURRENCY', '2'))
         
         # Premium PE/VC focused news sources
         self.financial_feeds = {
@@ -36,39 +1676,258 @@ class FinancialNewsletterBot:
             'CNBC': 'https://www.cnbc.com/id/100003114/device/rss/rss.html'
         }
         
-        # PE/VC relevant market indicators (updated selection)
-        # REPLACED entire array:
-        # OLD: ['SPY', 'QQQ', 'VTI', 'EFA', 'EEM', 'TNX', 'GLD', 'DXY', 'CL=F']
-        self.market_symbols = ['^GSPC', '^FTSE', '^DJI', '^IXIC', '^RUT', 'CL=F', 'BTC-USD']
+        # PE/VC relevant market indicators (updated selection)
+        # REPLACED entire array:
+        # OLD: ['SPY', 'QQQ', 'VTI', 'EFA', 'EEM', 'TNX', 'GLD', 'DXY', 'CL=F']
+        self.market_symbols = ['^GSPC', '^FTSE', '^DJI', '^IXIC', '^RUT', 'CL=F', 'BTC-USD']
+        
+        # Market quotes are fetched in parallel (cap concurrency to stay polite)
+        self.market_concurrency = int(os.getenv('MARKET_CONCURRENCY', '4'))
+        self.market_host = 'query1.finance.yahoo.com'
+        self.quote_max_bytes = 2 * 1024 * 1024
+        
+        # Concurrent feed fetching: all feeds in parallel, polite per host, bounded by a global deadline
+        self.fetch_workers = int(os.getenv('FETCH_WORKERS', '8'))
+        self.per_host_limit = 1          # Concurrent requests allowed against one host
+        self.per_host_delay = 0.8        # Seconds between requests to the same host (token bucket refill)
+        self.fetch_deadline = float(os.getenv('FETCH_DEADLINE', '60'))
+        self.feed_accept = 'application/rss+xml, application/atom+xml, application/xml, text/xml'
+        self.feed_max_bytes = int(os.getenv('FEED_MAX_BYTES', str(8 * 1024 * 1024)))
+        self.entries_per_feed = 10       # Entries considered per feed
+        self.fallback_hedge_delay = 5.0  # Seconds to wait on the preferred URL before racing alternatives
+        
+        # Every HTTP request (feeds, quotes, article pages) goes through one pooled transport
+        self.http = HttpTransport(
+            {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+                'Accept-Language': 'en-US,en;q=0.9'
+            },
+            metrics=self.metrics,
+            timeout=float(os.getenv('HTTP_TIMEOUT', '20')),
+            retries=int(os.getenv('HTTP_RETRIES', '2')),
+            concurrency=self.per_host_limit,
+            rate=1 / self.per_host_delay,
+            burst=1
+        )
+        self.http.configure_host(
+            self.market_host, self.market_concurrency, rate=10, burst=self.market_concurrency
+        )
+        
+        # Process-pool parsing: download raw bytes on the fetch threads, parse and pre-filter on every core
+        # (PARSE_PROCESSES=auto uses all cores; 0 parses on the fetch threads)
+        processes = os.getenv('PARSE_PROCESSES', '0').strip().lower()
+        self.parse_processes = (os.cpu_count() or 1) if processes == 'auto' else int(processes or 0)
+        self.parse_pool = None
+        self._parse_guard = threading.Lock()
+        self._parse_in_flight = 0
+        self._parse_busy_since = 0.0
+        self.parse_stats = {'documents': 0, 'worker_seconds': 0.0, 'busy_seconds': 0.0}
+        
+        # Streaming lxml parser that stops after entries_per_feed (feedparser remains the fallback)
+        self.fast_feed_parser = (
+            os.getenv('FAST_FEED_PARSER', '1').lower() not in ('0', 'false', 'no')
+            and importlib.util.find_spec('lxml') is not None
+        )
+        
+        # Comprehensive PE/VC keywords for better filtering
+        self.pe_vc_keywords = [
+            # Private Equity
+            'private equity', 'pe firm', 'buyout', 'lbo', 'leveraged buyout',
+            'management buyout', 'mbo', 'secondary buyout', 'take private',
+            'financial sponsor', 'sponsor', 'portfolio company', 'portco',
+            
+            # Venture Capital
+            'venture capital', 'vc', 'startup', 'funding round', 'series a', 'series b', 'series c',
+            'seed funding', 'pre-seed', 'bridge round', 'down round', 'up round',
+            'unicorn', 'decacorn', 'venture funding', 'early stage', 'late stage',
+            
+            # Growth & Capital
+            'growth capital', 'growth equity', 'mezzanine', 'expansion capital',
+            'recapitalization', 'dividend recap', 'refinancing',
+            
+            # Fund Operations
+            'fund raising', 'fundraising', 'capital raise', 'fund size', 'first close',
+            'final close', 'limited partners', 'lp', 'gp', 'general partner',
+            'management fee', 'carried interest', 'carry', 'hurdle rate',
+            'dry powder', 'deployment', 'vintage year',
+            
+            # Exits & Returns
+            'exit strategy', 'ipo', 'acquisition', 'merger', 'm&a', 'deal', 'investment',
+            'trade sale', 'strategic sale', 'secondary sale', 'continuation fund',
+            'irr', 'multiple', 'tvpi', 'dpi', 'rvpi',
+            
+            # Major PE/VC Firms (ScopeLP Focus)
+            '26north', 'abry', 'accel kkr', 'adia', 'advent', 'aea', 'american industrial partners',
+            'alpine', 'american securities', 'antin infra', 'apax', 'apollo', 'ares',
+            'arlington capital', 'arcline', 'bain', 'baypine', 'bc partners', 'bdt', 'msd',
+            'berkshire partners', 'blackstone', 'brightstar', 'butterfly equity', 'calera',
+            'carlyle', 'ccmp', 'cd&r', 'centerbridge', 'cerberus', 'charlesbank', 'cinven',
+            'clearlake', 'cornell capital', 'court square', 'cvc', 'elliott', 'eqt',
+            'fairfax', 'fortress', 'francisco', 'gamut', 'general atlantic', 'genstar',
+            'gi partners', 'golden gate', 'greenbriar', 'gsam', 'gtcr', 'h&f', 'haveli',
+            'harvest partners', 'hg', 'hig', 'hps', 'insight partners', 'kelso', 'kkr',
+            'kohlberg', 'kps', 'l catterton', 'leonard green', 'lindsay goldberg', 'littlejohn',
+            'lone star', 'madison dearborn', 'mubadala', 'new mountain', 'oak hill', 'oaktree',
+            'odyssey', 'olympus', 'omers', 'one rock', 'onex', 'pai', 'parthenon',
+            'partners group', 'patient square', 'permira', 'platinum', 'pritzker private capital',
+            'providence', 'reverence', 'rhône group', 'roark', 'searchlight', 'silver lake',
+            'siris capital', 'sk capital', 'stone canyon', 'stone point', 'stonepeak',
+            'summit partners', 'svp capital', 'symphony', 'ta associates', 'thoma bravo',
+            'thl', 'tjc', 'towerbrook', 'tpg', 'tpg real estate', 'truelink', 'tsg consumer',
+            'veritas', 'vista', 'warburg pincus', 'welsh carson', 'cppib', 'gryphon investors',
+            'graham partners', 'birch hill', 'torquest', 'novacap', 'oncap', 'sterling',
+            'altas', 'sagard'
+        ]
+        
+        # Additional PE/VC terms for broader matching
+        self.additional_pe_vc_terms = [
+            'portfolio company', 'portco', 'growth capital', 'growth equity',
+            'limited partners', 'lp', 'gp', 'general partner', 'fund manager',
+            'dry powder', 'carried interest', 'management fee', 'irr',
+            'sponsor', 'financial sponsor', 'buyout firm', 'investment firm'
+        ]
+        
+        # Exclude hedge fund and crypto content
+        self.exclude_keywords = [
+            'hedge fund', 'hedge funds', 'cryptocurrency', 'crypto', 'bitcoin', 'ethereum',
+            'forex', 'currency trading', 'commodity trading', 'derivatives', 'short selling'
+        ]
+        
+        # General business/market news terms for the Global Markets section
+        self.general_business_terms = [
+            'earnings', 'revenue', 'profit', 'loss', 'stock price', 'shares',
+            'market cap', 'dividend', 'analyst', 'forecast', 'guidance',
+            'ceo', 'cfo', 'executive', 'board', 'chairman', 'director',
+            'quarterly results', 'annual report', 'financial results',
+            'market update', 'trading', 'investor', 'shareholder'
+        ]
+        
+        # Specialized PE/VC sources are always relevant
+        self.specialized_sources = {
+            'PE News', 'Private Equity Wire', 'Private Equity International', 
+            'Buyouts Insider', 'Private Capital Journal', 'PE Hub',"Financial Times", 'Wall Street Journal',
+            'Bloomberg Markets','Reuters Business','PitchBook News', 'TechCrunch Startups', 'CNBC'    
+        }
+        
+        # Major sources allowed to contribute general business news for Global Markets
+        self.major_sources = {
+            'Financial Times', 'Wall Street Journal', 'Bloomberg Markets', 'Bloomberg Business',
+            'Reuters Business', 'Reuters Markets', 'CNBC'
+        }
         
-        # Comprehensive PE/VC keywords for better filtering
-        self.pe_vc_keywords = [
-            # Private Equity
-            'private equity', 'pe firm', 'buyout', 'lbo', 'leveraged buyout',
-            'management buyout', 'mbo', 'secondary buyout', 'take private',
-            'financial sponsor', 'sponsor', 'portfolio company', 'portco',
+        # Category rules, checked in order (first match wins)
+        self.category_keywords = [
+            # Global Markets (broad financial markets, not PE/VC specific)
+            ('Global Markets', ['stock market', 'trading', 'index', 'bond market', 'commodity', 'currency', 'forex', 'fed', 'federal reserve', 'central bank', 'interest rate', 'inflation', 'gdp', 'economic data', 'treasury', 'yields']),
+            # Private Equity deals and buyouts
+            ('Private Equity', ['buyout', 'lbo', 'leveraged buyout', 'take private', 'private equity', 'pe firm', 'portfolio company acquisition']),
+            # Venture Capital funding rounds
+            ('Venture Capital', ['venture capital', 'vc', 'startup funding', 'series a', 'series b', 'series c', 'seed funding', 'pre-seed', 'growth round']),
+            # Private Credit and direct lending
+            ('Private Credit', ['private credit', 'direct lending', 'credit fund', 'debt fund', 'mezzanine', 'bdc', 'business development company', 'private debt', 'credit strategy']),
+            # IPOs and public offerings
+            ('IPOs', ['ipo', 'public offering', 'listing', 'debut', 'going public', 'spac']),
+            # Bankruptcy and distressed situations
+            ('Bankruptcy', ['bankruptcy', 'chapter 11', 'distressed', 'restructuring', 'liquidation', 'insolvency', 'creditor', 'debtor']),
+            # PE Secondaries market
+            ('PE Secondaries', ['secondary', 'secondaries', 'continuation fund', 'gp-led', 'lp-led', 'process sale', 'portfolio sale']),
+            # General deal activity defaults to PE
+            ('Private Equity', ['m&a', 'merger', 'acquisition', 'takeover', 'deal']),
+        ]
+        self.generic_fund_keywords = ['mutual fund', 'etf', 'index fund', 'hedge fund', 'pension fund', 'sovereign wealth', 'lending rates', 'interest rates', 'trade deal', 'tariffs', 'china', 'fidelity', 'blackrock']
+        self.generic_fund_exclusions = ['private equity', 'venture capital', 'buyout', 'pe firm', 'vc firm']
+        
+        # Per-category quotas drive both selection and rendering; sections render in this order.
+        # Override with e.g. CATEGORY_QUOTAS="Global Markets=6,Private Equity=15"
+        self.category_quotas = {
+            'Global Markets': 8,     # More articles for markets overview
+            'Private Equity': 12,    # Standard limit for deal sections
+            'Venture Capital': 12,
+            'Private Credit': 12,
+            'IPOs': 12,
+            'Bankruptcy': 12,
+            'PE Secondaries': 12,
+        }
+        self.category_quotas.update(self.parse_category_quotas(os.getenv('CATEGORY_QUOTAS', '')))
+        
+        # ENHANCED Geographic priority - North America and Europe (MUCH HIGHER WEIGHT)
+        self.na_europe_keywords = [
+            # North America - Major cities and financial centers
+            'united states', 'u.s.', 'us ', 'usa', 'america', 'american', 'canada', 'canadian', 
+            'new york', 'nyc', 'manhattan', 'silicon valley', 'san francisco', 'bay area', 
+            'boston', 'chicago', 'los angeles', 'seattle', 'austin', 'dallas', 'houston',
+            'miami', 'atlanta', 'washington dc', 'philadelphia', 'denver', 'phoenix',
+            'toronto', 'montreal', 'vancouver', 'calgary', 'ottawa',
             
-            # Venture Capital
-            'venture capital', 'vc', 'startup', 'funding round', 'series a', 'series b', 'series c',
-            'seed funding', 'pre-seed', 'bridge round', 'down round', 'up round',
-            'unicorn', 'decacorn', 'venture funding', 'early stage', 'late stage',
+            # US States
+            'california', 'texas', 'florida', 'illinois', 'massachusetts', 'pennsylvania',
+            'ohio', 'michigan', 'georgia', 'north carolina', 'virginia', 'maryland',
             
-            # Growth & Capital
-            'growth capital', 'growth equity', 'mezzanine', 'expansion capital',
-            'recapitalization', 'dividend recap', 'refinancing',
+            # Financial indicators
+            'wall street', 'nasdaq', 'nyse', 'tsx', 'sec', 'federal reserve', 'fed',
             
-            # Fund Operations
-            'fund raising', 'fundraising', 'capital raise', 'fund size', 'first close',
-            'final close', 'limited partners', 'lp', 'gp', 'general partner',
-            'management fee', 'carried interest', 'carry', 'hurdle rate',
-            'dry powder', 'deployment', 'vintage year',
+            # Europe - Major countries and cities
+            'europe', 'european', 'eu ', 'eurozone',
+            'uk', 'u.k.', 'united kingdom', 'britain', 'british', 'london', 'england', 'scotland',
+            'germany', 'german', 'berlin', 'frankfurt', 'munich', 'hamburg',
+            'france', 'french', 'paris', 'lyon', 'marseille',
+            'italy', 'italian', 'milan', 'rome', 'turin',
+            'spain', 'spanish', 'madrid', 'barcelona',
+            'netherlands', 'dutch', 'amsterdam', 'rotterdam',
+            'switzerland', 'swiss', 'zurich', 'geneva', 'basel',
+            'sweden', 'swedish', 'stockholm', 'gothenburg',
+            'norway', 'norwegian', 'oslo',
+            'denmark', 'danish', 'copenhagen',
+            'finland', 'finnish', 'helsinki',
+            'austria', 'austrian', 'vienna',
+            'belgium', 'belgian', 'brussels',
+            'ireland', 'irish', 'dublin',
+            'portugal', 'portuguese', 'lisbon',
+            'poland', 'polish', 'warsaw',
+            'luxembourg', 'czech', 'prague',
             
-            # Exits & Returns
-            'exit strategy', 'ipo', 'acquisition', 'merger', 'm&a', 'deal', 'investment',
-            'trade sale', 'strategic sale', 'secondary sale', 'continuation fund',
-            'irr', 'multiple', 'tvpi', 'dpi', 'rvpi',
+            # European financial centers and exchanges
+            'lse', 'london stock exchange', 'ftse', 'dax', 'cac', 'stoxx', 'euronext',
+            'city of london', 'canary wharf', 'la défense', 'frankfurt stock exchange',
             
-            # Major PE/VC Firms (ScopeLP Focus)
+            # Middle East - NEW ADDITION
+            'middle east', 'gulf', 'gcc', 'mena',
+            'saudi arabia', 'saudi', 'riyadh', 'jeddah', 'ksa', 'kingdom of saudi arabia',
+            'qatar', 'qatari', 'doha', 'qatar investment authority', 'qia',
+            'kuwait', 'kuwaiti', 'kuwait city', 'kic', 'kuwait investment corporation',
+            'uae', 'united arab emirates', 'dubai', 'abu dhabi', 'emirates', 'emirati',
+            'adia', 'abu dhabi investment authority', 'mubadala', 'emirates investment authority',
+            'sovereign wealth fund', 'swf', 'pension investment corporation', 'pic',
+            'aramco', 'saudi aramco', 'adnoc', 'emirates nbd', 'first abu dhabi bank',
+            'qatar national bank', 'qnb', 'national bank of kuwait', 'nbk'
+        ]
+        
+        # PENALTY for Asia-Pacific and other regions (negative scoring)
+        self.apac_keywords = [
+            'china', 'chinese', 'beijing', 'shanghai', 'shenzhen', 'hong kong',
+            'japan', 'japanese', 'tokyo', 'osaka',
+            'singapore', 'singaporean',
+            'india', 'indian', 'mumbai', 'delhi', 'bangalore',
+            'australia', 'australian', 'sydney', 'melbourne',
+            'korea', 'korean', 'seoul',
+            'indonesia', 'jakarta', 'thailand', 'bangkok',
+            'malaysia', 'kuala lumpur', 'vietnam', 'philippines',
+            'africa', 'african', 'south africa', 'nigeria', 'kenya',
+            'latin america', 'brazil', 'brazilian', 'mexico', 'mexican',
+            'argentina', 'chile', 'colombia'
+        ]
+        
+        # High / medium priority scoring keywords
+        self.high_priority_keywords = [
+            'private equity', 'venture capital', 'buyout', 'funding round', 'ipo', 'acquisition',
+            'series a', 'series b', 'series c', 'growth capital', 'lbo'
+        ]
+        self.medium_priority_keywords = [
+            'investment', 'startup', 'portfolio', 'exit', 'valuation', 'fund', 'sponsor'
+        ]
+        
+        # PE/VC firm names (ScopeLP monitoring list) - mostly NA/EU firms
+        self.scopelp_firms = [
             '26north', 'abry', 'accel kkr', 'adia', 'advent', 'aea', 'american industrial partners',
             'alpine', 'american securities', 'antin infra', 'apax', 'apollo', 'ares',
             'arlington capital', 'arcline', 'bain', 'baypine', 'bc partners', 'bdt', 'msd',
@@ -90,94 +1949,411 @@ class FinancialNewsletterBot:
             'graham partners', 'birch hill', 'torquest', 'novacap', 'oncap', 'sterling',
             'altas', 'sagard'
         ]
+        
+        # Deal size indicators and NA/EU currency indicators
+        self.deal_indicators = ['billion', 'million', 'valuation', 'fund size']
+        self.currency_indicators = ['$', 'usd', 'dollar', 'eur', 'euro', 'gbp', 'pound']
+        
+        # Weighted scoring model: every feature is a count derived from the keyword hits,
+        # so an article's score is a dot product of its feature vector with these weights
+        self.score_weights = {
+            'source_priority': 2,    # Source priority weight
+            'geo': 10,               # NA/EU/Middle East mentions (increased from 3 to 10)
+            'geo_multi': 20,         # Extra bonus for 2+ location mentions
+            'geo_strong': 30,        # Even more for 3+ location mentions
+            'apac_only': -15,        # Penalty per APAC/other mention when there is no NA/EU mention
+            'high_priority': 8,
+            'medium_priority': 4,
+            'firm': 15,              # ScopeLP monitoring list
+            'deal': 3,               # Deal size indicators
+            'currency': 5,           # Any NA/EU currency mention
+        }
+        self.score_features = list(self.score_weights)
+        
+        # Subscriber profiles: per-recipient keywords, firm watchlist, category quotas and region weights
+        self.profile_keyword_weight = 10   # Per profile keyword hit
+        self.profile_firm_weight = 25      # Per watchlist firm hit
+        self.region_features = {
+            'na_europe': ('geo', 'geo_multi', 'geo_strong'),
+            'apac': ('apac_only',),
+        }
+        self.profiles = self.load_profiles()
+        
+        # Local state (feed cache etc.) - persisted between runs, e.g. via actions/cache
+        self.state_dir = os.getenv(
+            'NEWSBRIEF_STATE_DIR',
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), '.newsbrief')
+        )
+        
+        # One compiled matcher shared by relevance filtering, categorization and scoring
+        self.keyword_matcher = self.load_keyword_matcher()
+        
+        # JSON run report (always) and Prometheus text (if NEWSBRIEF_PROMETHEUS is set)
+        self.run_report_path = os.getenv('NEWSBRIEF_RUN_REPORT', os.path.join(self.state_dir, 'run-report.json'))
+        self.prometheus_path = os.getenv('NEWSBRIEF_PROMETHEUS')
+        self.feed_cache = self.open_feed_cache()
+        self.price_store = self.open_price_store()
+        
+        # Stories already mailed in the last SEEN_TTL_DAYS are dropped before any processing (0 disables)
+        self.seen_ttl_days = float(os.getenv('SEEN_TTL_DAYS', '7'))
+        self.seen_index = self.open_seen_index()
+        self.feed_health = self.open_feed_health()
+        
+        # Optional enrichment: fetch the pages of thin-summary candidates and extract their lead paragraphs
+        self.enrich_articles = os.getenv('ENRICH_ARTICLES', '').lower() in ('1', 'true', 'yes')
+        self.enrich_workers = int(os.getenv('ENRICH_WORKERS', '6'))
+        self.enrich_max_articles = int(os.getenv('ENRICH_MAX_ARTICLES', '40'))  # Page fetches per run
+        self.enrich_min_summary = 200        # Summaries shorter than this are enriched
+        self.enrich_paragraphs = 3           # Lead paragraphs kept per page
+        self.enrich_timeout = 10             # Read timeout for article pages (feeds and quotes use HTTP_TIMEOUT)
+        self.enrich_max_bytes = 2 * 1024 * 1024
+        self.html_parser = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+        self.article_text_cache = self.open_article_text_cache()
+        
+        # Every sent issue is archived for later search (NEWSBRIEF_ARCHIVE='' disables it)
+        self.archive_path = os.getenv('NEWSBRIEF_ARCHIVE', os.path.join(self.state_dir, 'archive.sqlite'))
+        self.issue_archive = self.open_issue_archive()
+        
+        # Daemon mode: poll feeds through the day into a warm pool, send from it at send_time
+        self.send_time = os.getenv('NEWSLETTER_SEND_TIME', '07:00')
+        self.daemon_poll_minutes = float(os.getenv('DAEMON_POLL_MINUTES', '30'))
+        self.pool_max_age_hours = float(os.getenv('POOL_MAX_AGE_HOURS', '36'))
+        self.breaking_alert_score = float(os.getenv('BREAKING_ALERT_SCORE', '0'))  # 0 disables alerts
+        self.alert_recipients = [
+            address.strip() for address in os.getenv('ALERT_RECIPIENTS', ','.join(self.recipients)).split(',')
+            if address.strip()
+        ]
+    
+    def load_profiles(self):
+        """Load subscriber profiles from NEWSBRIEF_PROFILES (default: profiles.json next to this script)
+        
+        Format: a JSON list of objects such as
+            {"name": "infra", "email": "a@x.com, b@x.com",
+             "keywords": ["data center"], "firms": ["stonepeak"],
+             "category_quotas": {"Global Markets": 4}, "region_weights": {"apac": 0.5}}
+        """
+        path = os.getenv('NEWSBRIEF_PROFILES', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles.json'))
+        if not os.path.exists(path):
+            return []
+        
+        try:
+            with open(path) as f:
+                raw_profiles = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not load subscriber profiles from {path}: {e}")
+            return []
+        
+        profiles = []
+        for raw in raw_profiles:
+            emails = raw.get('email') or ''
+            if isinstance(emails, str):
+                emails = emails.split(',')
+            emails = [address.strip() for address in emails if address.strip()]
+            if not raw.get('name') or not emails:
+                print(f"⚠️ Skipping profile without name/email: {raw}")
+                continue
+            profiles.append({
+                'name': raw['name'],
+                'emails': emails,
+                'keywords': [keyword.lower() for keyword in raw.get('keywords', [])],
+                'firms': [firm.lower() for firm in raw.get('firms', [])],
+                'category_quotas': {**self.category_quotas, **raw.get('category_quotas', {})},
+                'region_weights': raw.get('region_weights', {}),
+            })
+        
+        print(f"👥 Loaded {len(profiles)} subscriber profiles")
+        return profiles
+    
+    def load_keyword_matcher(self):
+        """Build the keyword matcher, reusing the cached lexicon artifact while the keyword lists are unchanged"""
+        groups = self.keyword_groups()
+        # The matcher's own format is part of the key, so a code change never loads a stale artifact
+        digest = hashlib.sha1(json.dumps({
+            'format': [KeywordMatcher.FORMAT_VERSION, KeywordMatcher.SUFFIX, KeywordMatcher.WORD_CHAR.pattern],
+            'groups': {label: sorted(keywords) for label, keywords in groups.items()}
+        }, sort_keys=True).encode('utf-8')).hexdigest()
+        path = os.path.join(self.state_dir, 'lexicon.json')
+        
+        try:
+            with open(path, encoding='utf-8') as f:
+                artifact = json.load(f)
+            if artifact.get('digest') == digest:
+                self.metrics.count('cache_hits', cache='lexicon')
+                return KeywordMatcher.from_artifact(artifact)
+        except (OSError, ValueError, KeyError):
+            pass
+        
+        self.metrics.count('cache_misses', cache='lexicon')
+        matcher = KeywordMatcher(groups)
+        try:
+            os.makedirs(self.state_dir, exist_ok=True)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(dict(matcher.to_artifact(), digest=digest), f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ Could not cache keyword lexicon: {e}")
+        return matcher
+    
+    def parse_category_quotas(self, spec):
+        """Parse "Category=N,Category=N" into a quota dict"""
+        quotas = {}
+        for item in spec.split(','):
+            if '=' not in item:
+                continue
+            category, limit = item.rsplit('=', 1)
+            try:
+                quotas[category.strip()] = int(limit)
+            except ValueError:
+                print(f"⚠️ Ignoring invalid category quota: {item.strip()}")
+        return quotas
+    
+    def open_feed_cache(self):
+        """Open the persistent feed cache (disabled if the state dir is unusable)"""
+        try:
+            os.makedirs(self.state_dir, exist_ok=True)
+            return FeedCache(os.path.join(self.state_dir, 'state.sqlite'))
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️ Feed cache disabled: {e}")
+            return None
+    
+    def open_seen_index(self):
+        """Open the cross-run index of already-mailed stories"""
+        if self.seen_ttl_days <= 0:
+            return None
+        try:
+            os.makedirs(self.state_dir, exist_ok=True)
+            return SeenArticleIndex(os.path.join(self.state_dir, 'state.sqlite'), ttl_days=self.seen_ttl_days)
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️ Seen-article index disabled: {e}")
+            return None
+    
+    def open_article_text_cache(self):
+        """Open the extracted-text cache; enrichment is switched off if beautifulsoup4 is missing"""
+        if not self.enrich_articles:
+            return None
+        if importlib.util.find_spec('bs4') is None:
+            print("⚠️ Article enrichment disabled: beautifulsoup4 is not installed")
+            self.enrich_articles = False
+            return None
+        try:
+            os.makedirs(self.state_dir, exist_ok=True)
+            return ArticleTextCache(os.path.join(self.state_dir, 'state.sqlite'))
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️ Article text cache disabled: {e}")
+            return None
+    
+    def open_issue_archive(self):
+        """Open the searchable archive of sent issues"""
+        if not self.archive_path:
+            return None
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.archive_path)), exist_ok=True)
+            return IssueArchive(self.archive_path)
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️ Issue archive disabled: {e}")
+            return None
+    
+    def open_feed_health(self):
+        """Open the persisted feed health registry / circuit breaker"""
+        try:
+            os.makedirs(self.state_dir, exist_ok=True)
+            return FeedHealthRegistry(os.path.join(self.state_dir, 'state.sqlite'))
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️ Feed health tracking disabled: {e}")
+            return None
+    
+    def feed_health_report(self, output_format='json'):
+        """Export feed health as JSON or CSV (for pruning dead feeds)"""
+        report = self.feed_health.report() if self.feed_health else []
+        for health in report:
+            for column in ('last_success', 'last_failure', 'open_until'):
+                if health[column]:
+                    health[column] = datetime.fromtimestamp(health[column]).isoformat(timespec='seconds')
+        
+        if output_format == 'csv':
+            buffer = io.StringIO()
+            columns = list(FeedHealthRegistry.COLUMNS) + ['error_rate', 'circuit']
+            writer = csv.DictWriter(buffer, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(report)
+            return buffer.getvalue()
+        return json.dumps(report, indent=2)
+    
+    def open_price_store(self):
+        """Open the local price history store (needs NumPy)"""
+        if np is None:
+            print("⚠️ NumPy not installed - price history store disabled")
+            return None
+        try:
+            return PriceHistoryStore(os.path.join(self.state_dir, 'prices'))
+        except OSError as e:
+            print(f"⚠️ Price history store disabled: {e}")
+            return None
+    
+    def get_ytd_window(self):
+        """Return (period1, period2) epoch seconds covering YTD plus a few prior sessions"""
+        now = datetime.now()
+        # Start a couple of weeks before Jan 1 so early-January runs still have a previous close
+        start = datetime(now.year, 1, 1) - timedelta(days=14)
+        return int(start.timestamp()), int(now.timestamp())
+    
+    def summarize_price_history(self, symbol, timestamps, close_prices):
+        """Compute last close, daily change and YTD performance from a daily close series"""
+        if not timestamps or not close_prices:
+            print(f"⚠️ {symbol}: No price history available")
+            return None
+        
+        # Find the last two valid trading days for comparison
+        last_close = None
+        previous_close = None
+        last_timestamp = None
+        ytd_start_price = None
+        
+        # Work backwards to find the most recent closing prices
+        for i in range(len(close_prices) - 1, -1, -1):
+            if close_prices[i] is not None:
+                if last_close is None:
+                    last_close = close_prices[i]
+                    last_timestamp = timestamps[i]
+                elif previous_close is None:
+                    previous_close = close_prices[i]
+                    break
+        
+        # Find YTD start price (first trading day of current year)
+        current_year = datetime.now().year
+        jan_1_timestamp = datetime(current_year, 1, 1).timestamp()
+        
+        # Look for first trading day in January
+        for i, ts in enumerate(timestamps):
+            if ts >= jan_1_timestamp and close_prices[i] is not None:
+                ytd_start_price = close_prices[i]
+                break
+        
+        return self.build_quote(symbol, last_close, previous_close, last_timestamp, ytd_start_price)
+    
+    def summarize_stored_history(self, symbol, history):
+        """Same summary as summarize_price_history, computed on the stored arrays"""
+        valid = history[~np.isnan(history['close'])]
+        if len(valid) < 2:
+            print(f"⚠️ {symbol}: Could not find valid closing prices")
+            return None
+        
+        jan_1_timestamp = datetime(datetime.now().year, 1, 1).timestamp()
+        ytd_index = int(np.searchsorted(valid['ts'], jan_1_timestamp))
+        ytd_start_price = float(valid['close'][ytd_index]) if ytd_index < len(valid) else None
+        
+        return self.build_quote(
+            symbol,
+            float(valid['close'][-1]),
+            float(valid['close'][-2]),
+            int(valid['ts'][-1]),
+            ytd_start_price
+        )
+    
+    def build_quote(self, symbol, last_close, previous_close, last_timestamp, ytd_start_price):
+        """Build the market data entry for one symbol"""
+        if not (last_close and previous_close):
+            print(f"⚠️ {symbol}: Could not find valid closing prices")
+            return None
+        
+        last_trading_date = datetime.fromtimestamp(last_timestamp).strftime('%Y-%m-%d')
+        change = last_close - previous_close
+        change_pct = (change / previous_close * 100) if previous_close != 0 else 0
+        
+        # Calculate YTD performance
+        ytd_pct = 0
+        if ytd_start_price and last_close:
+            ytd_pct = ((last_close - ytd_start_price) / ytd_start_price * 100)
+            print(f"📊 {symbol} YTD: ${ytd_start_price:.2f} → ${last_close:.2f} = {ytd_pct:+.1f}%")
+        
+        print(f"✅ {symbol}: ${last_close:.2f} ({change_pct:+.1f}% daily, {ytd_pct:+.1f}% YTD) - Close {last_trading_date}")
+        return {
+            'price': float(last_close),
+            'change': float(change),
+            'change_pct': float(change_pct),
+            'ytd_pct': float(ytd_pct),
+            'trading_date': last_trading_date
+        }
+    
+    def fetch_symbol_data(self, symbol, period1, period2):
+        """Fetch daily closes for one symbol (only new bars if history is stored) and summarize them"""
+        window_start = period1
+        if self.price_store:
+            last_ts = self.price_store.last_timestamp(symbol)
+            self.metrics.count('cache_hits' if last_ts else 'cache_misses', cache='prices')
+            if last_ts and last_ts >= period1:
+                # Re-request the last stored bar too, it may have been a partial session
+                period1 = last_ts
+        
+        url = f"https://{self.market_host}/v8/finance/chart/{symbol}"
+        params = {'period1': period1, 'period2': period2, 'interval': '1d'}
+        
+        with self.metrics.span('quote', symbol=symbol):
+            response = self.http.get(url, params=params, max_bytes=self.quote_max_bytes)
+        self.metrics.count('bytes_downloaded', response.wire_bytes, kind='quotes')
+        print(f"📈 Fetching {symbol}: Status {response.status_code}")
+        
+        timestamps, close_prices = [], []
+        if response.status_code != 200:
+            print(f"❌ {symbol}: HTTP {response.status_code}")
+        elif response.truncated:
+            print(f"❌ {symbol}: response larger than {self.quote_max_bytes} bytes")
+        else:
+            data = response.json()
+            if 'chart' in data and 'result' in data['chart'] and data['chart']['result']:
+                result = data['chart']['result'][0]
+                
+                # Get trading timestamps and closing prices
+                timestamps = result.get('timestamp') or []
+                prices_data = result.get('indicators', {}).get('quote', [{}])[0]
+                close_prices = prices_data.get('close') or []
+            else:
+                print(f"⚠️ {symbol}: Invalid response structure")
+        
+        if not self.price_store:
+            return self.summarize_price_history(symbol, timestamps, close_prices) if timestamps else None
+        
+        if timestamps and len(timestamps) == len(close_prices):
+            self.price_store.merge(symbol, timestamps, close_prices, keep_since=window_start)
+        
+        history = self.price_store.load(symbol)
+        if history is None or len(history) == 0:
+            print(f"⚠️ {symbol}: No price history available")
+            return None
+        if not timestamps:
+            print(f"⚠️ {symbol}: Using stored closes only")
+        return self.summarize_stored_history(symbol, history)
     
     def get_market_data(self):
         """Fetch closing prices from the last trading date with YTD performance"""
+        with self.metrics.span('market'):
+            return self.fetch_market_quotes()
+    
+    def fetch_market_quotes(self):
+        """Fetch every market symbol in parallel over the shared transport"""
         try:
             market_data = {}
             print("📊 Fetching closing prices and YTD performance...")
             
-            for symbol in self.market_symbols:
-                try:
-                    # Get 1 year of data to calculate YTD performance accurately
-                    url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}?range=1y&interval=1d"
-                    headers = {
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                    }
-                    
-                    response = requests.get(url, headers=headers, timeout=15)
-                    print(f"📈 Fetching {symbol}: Status {response.status_code}")
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        if 'chart' in data and 'result' in data['chart'] and data['chart']['result']:
-                            result = data['chart']['result'][0]
-                            
-                            # Get trading timestamps and closing prices
-                            timestamps = result.get('timestamp', [])
-                            prices_data = result.get('indicators', {}).get('quote', [{}])[0]
-                            close_prices = prices_data.get('close', [])
-                            
-                            if timestamps and close_prices:
-                                # Find the last two valid trading days for comparison
-                                last_close = None
-                                previous_close = None
-                                last_trading_date = None
-                                ytd_start_price = None
-                                
-                                # Work backwards to find the most recent closing prices
-                                for i in range(len(close_prices) - 1, -1, -1):
-                                    if close_prices[i] is not None:
-                                        if last_close is None:
-                                            last_close = close_prices[i]
-                                            last_trading_date = datetime.fromtimestamp(timestamps[i]).strftime('%Y-%m-%d')
-                                        elif previous_close is None:
-                                            previous_close = close_prices[i]
-                                            break
-                                
-                                # Find YTD start price (first trading day of current year)
-                                current_year = datetime.now().year
-                                jan_1_timestamp = datetime(current_year, 1, 1).timestamp()
-                                
-                                # Look for first trading day in January
-                                for i, ts in enumerate(timestamps):
-                                    if ts >= jan_1_timestamp and close_prices[i] is not None:
-                                        ytd_start_price = close_prices[i]
-                                        ytd_start_date = datetime.fromtimestamp(ts).strftime('%Y-%m-%d')
-                                        break
-                                
-                                if last_close and previous_close:
-                                    change = last_close - previous_close
-                                    change_pct = (change / previous_close * 100) if previous_close != 0 else 0
-                                    
-                                    # Calculate YTD performance
-                                    ytd_pct = 0
-                                    if ytd_start_price and last_close:
-                                        ytd_pct = ((last_close - ytd_start_price) / ytd_start_price * 100)
-                                        print(f"📊 {symbol} YTD: ${ytd_start_price:.2f} → ${last_close:.2f} = {ytd_pct:+.1f}%")
-                                    
-                                    market_data[symbol] = {
-                                        'price': float(last_close),
-                                        'change': float(change),
-                                        'change_pct': float(change_pct),
-                                        'ytd_pct': float(ytd_pct),
-                                        'trading_date': last_trading_date
-                                    }
-                                    print(f"✅ {symbol}: ${last_close:.2f} ({change_pct:+.1f}% daily, {ytd_pct:+.1f}% YTD) - Close {last_trading_date}")
-                                else:
-                                    print(f"⚠️ {symbol}: Could not find valid closing prices")
-                            else:
-                                print(f"⚠️ {symbol}: No price history available")
-                        else:
-                            print(f"⚠️ {symbol}: Invalid response structure")
-                    else:
-                        print(f"❌ {symbol}: HTTP {response.status_code}")
-                    
-                    time.sleep(0.4)  # Slightly longer delay for larger data requests
-                    
-                except Exception as e:
-                    print(f"❌ Error fetching {symbol}: {e}")
-                    continue
+            # Only request the window we need (YTD), not a full year of bars
+            period1, period2 = self.get_ytd_window()
+            workers = max(1, min(self.market_concurrency, len(self.market_symbols)))
+            
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='quote') as executor:
+                futures = {
+                    executor.submit(self.fetch_symbol_data, symbol, period1, period2): symbol
+                    for symbol in self.market_symbols
+                }
+                for future in as_completed(futures):
+                    symbol = futures[future]
+                    try:
+                        symbol_data = future.result()
+                    except Exception as e:
+                        print(f"❌ Error fetching {symbol}: {e}")
+                        continue
+                    if symbol_data:
+                        market_data[symbol] = symbol_data
             
             print(f"📊 Successfully fetched closing data with YTD for {len(market_data)} symbols")
             return market_data
@@ -186,69 +2362,579 @@ class FinancialNewsletterBot:
             print(f"❌ Error in get_market_data: {e}")
             return {}
     
-    def fetch_financial_news(self, max_articles=60):
-        """Fetch PE/VC focused financial news from premium sources"""
-        all_articles = []
+    def fetch_feed(self, source_name, feed_url):
+        """Fetch a source and record its health (latency, entries, failures)"""
+        started = time.monotonic()
+        feed = self.fetch_feed_with_fallback(source_name, feed_url)
+        latency = time.monotonic() - started
+        healthy = self.is_healthy_feed(feed)
+        self.metrics.observe('fetch', latency, source=source_name)
+        if not healthy:
+            self.metrics.count('feed_errors', source=source_name)
         
-        for source_name, feed_url in self.financial_feeds.items():
-            try:
-                # Add user agent to avoid blocking
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                    'Accept': 'application/rss+xml, application/xml, text/xml',
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'Accept-Encoding': 'gzip, deflate, br',
-                    'Connection': 'keep-alive',
-                    'Upgrade-Insecure-Requests': '1'
-                }
+        if self.feed_health:
+            error = None
+            if not healthy:
+                error = str(feed.get('bozo_exception') or f"HTTP {feed.get('status')}") if feed is not None else 'no healthy URL'
+            open_until = self.feed_health.record(
+                source_name, healthy, latency,
+                entries=feed.get('total_entries', len(feed.entries)) if healthy else 0, error=error
+            )
+            if open_until:
+                print(f"⛔ {source_name} failed repeatedly, circuit open until {datetime.fromtimestamp(open_until):%Y-%m-%d %H:%M}")
+        
+        return feed
+    
+    def fetch_feed_with_fallback(self, source_name, feed_url):
+        """Fetch a source, racing its alternative URLs if the preferred one is slow or unhealthy"""
+        candidates = self.feed_candidates(source_name, feed_url)
+        executor = ThreadPoolExecutor(max_workers=len(candidates), thread_name_prefix='fallback')
+        
+        try:
+            # Start with the URL that worked last time; hedge with the rest if it stalls or fails
+            pending = {executor.submit(self.try_feed_url, source_name, candidates[0]): candidates[0]}
+            alternatives = candidates[1:]
+            
+            while pending:
+                timeout = self.fallback_hedge_delay if alternatives else None
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
                 
-                # Parse RSS with custom headers
-                feed = feedparser.parse(feed_url, request_headers=headers)
+                for future in done:
+                    url = pending.pop(future)
+                    feed = future.result()
+                    if self.is_healthy_feed(feed):
+                        self.record_feed_route(source_name, feed_url, url)
+                        return feed
                 
-                if feed.entries:
-                    print(f"✅ Fetched {len(feed.entries)} articles from {source_name}")
-                    
-                    for entry in feed.entries[:10]:  # More articles for better filtering
-                        # Clean and format the summary
-                        summary = self.clean_summary(entry.get('summary', entry.title))
-                        
-                        # Filter for PE/VC relevance (more lenient for specialized sources)
-                        if self.is_pe_vc_relevant(entry.title + ' ' + summary, source_name):
-                            article = {
-                                'title': entry.title,
-                                'summary': summary,
-                                'link': entry.link,
-                                'source': source_name,
-                                'published': entry.get('published', 'Recent'),
-                                'category': self.categorize_article(entry.title + ' ' + summary),
-                                'priority': self.get_source_priority(source_name)
-                            }
-                            all_articles.append(article)
+                if alternatives:
+                    print(f"🔀 Racing {len(alternatives)} alternative RSS URL(s) for {source_name}")
+                    for url in alternatives:
+                        pending[executor.submit(self.try_feed_url, source_name, url)] = url
+                    alternatives = []
+            
+            print(f"❌ No healthy RSS URL for {source_name}")
+            return None
+        
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def feed_candidates(self, source_name, feed_url):
+        """Primary and alternative URLs for a source, the last winning URL first"""
+        candidates = [feed_url] + self.get_alternative_rss_urls(source_name)
+        preferred = self.feed_cache.get_route(source_name) if self.feed_cache else None
+        if preferred in candidates:
+            candidates.remove(preferred)
+            candidates.insert(0, preferred)
+        return list(dict.fromkeys(candidates))
+    
+    def try_feed_url(self, source_name, url):
+        """Fetch one candidate URL; errors are reported and turned into None"""
+        try:
+            return self.parse_feed_url(source_name, url)
+        except Exception as e:
+            print(f"❌ Error fetching {url} for {source_name}: {e}")
+            return None
+    
+    def is_healthy_feed(self, feed):
+        """A feed counts as healthy if it returned entries (even if all were pre-filtered) or a 304 for cached entries"""
+        if feed is None:
+            return False
+        if feed.get('status', 200) >= 400:
+            return False
+        return feed.get('status') == 304 or bool(feed.get('entries')) or feed.get('total_entries', 0) > 0
+    
+    def record_feed_route(self, source_name, primary_url, winning_url):
+        """Remember which URL served the source so the next run tries it first"""
+        if winning_url != primary_url:
+            print(f"✅ Using alternative RSS for {source_name}: {winning_url}")
+        if self.feed_cache and self.feed_cache.get_route(source_name) != winning_url:
+            self.feed_cache.set_route(source_name, winning_url)
+    
+    def parse_feed_url(self, source_name, feed_url):
+        """Conditional GET of one feed URL, then parse it here (the fast path) or parse and pre-filter it
+        in the process pool; a 304 reuses the cached entries"""
+        cached = self.feed_cache.get(feed_url) if self.feed_cache else None
+        headers = {'Accept': self.feed_accept}
+        if cached and cached['etag']:
+            headers['If-None-Match'] = cached['etag']
+        if cached and cached['modified']:
+            headers['If-Modified-Since'] = cached['modified']
+        
+        with self.metrics.span('download', source=source_name):
+            response = self.http.get(feed_url, headers=headers, max_bytes=self.feed_max_bytes)
+        self.metrics.count('bytes_downloaded', response.wire_bytes, kind='feeds')
+        if response.truncated:
+            # The leading entries are all the pipeline reads, so a capped body is usually still usable
+            print(f"✂️ {source_name} feed exceeds {self.feed_max_bytes} bytes, parsing the first part")
+        
+        if response.status_code == 304 and cached:
+            self.metrics.count('cache_hits', cache='feed')
+            print(f"♻️ {source_name} unchanged since last run (304), using cached entries")
+            return feedparser.FeedParserDict(
+                entries=[feedparser.FeedParserDict(entry) for entry in cached['entries']],
+                status=304
+            )
+        if response.status_code >= 400:
+            return feedparser.FeedParserDict(entries=[], status=response.status_code)
+        
+        if self.parse_pool is None:
+            with self.metrics.span('parse', source=source_name):
+                feed = parse_feed_bytes(
+                    response.content, dict(response.headers), self.entries_per_feed, self.fast_feed_parser
+                )
+            self.metrics.count('feeds_parsed', parser=feed.parser)
+            feed['status'] = response.status_code
+            feed['etag'] = response.headers.get('ETag')
+            feed['modified'] = response.headers.get('Last-Modified')
+            if self.feed_cache and feed.entries and (feed.etag or feed.modified):
+                self.feed_cache.store(feed_url, feed.etag, feed.modified, feed.entries[:self.entries_per_feed])
+            return feed
+        
+        self.parse_started()
+        try:
+            total, kept, already_seen, error, parser, seconds = self.parse_pool.submit(
+                parse_feed_document, source_name, response.content, dict(response.headers)
+            ).result()
+        finally:
+            self.parse_finished()
+        self.metrics.observe('parse', seconds, source=source_name)
+        self.metrics.count('feeds_parsed', parser=parser)
+        with self._parse_guard:
+            self.parse_stats['documents'] += 1
+            self.parse_stats['worker_seconds'] += seconds
+        if total > len(kept):
+            self.metrics.count('entries_prefiltered', total - len(kept), source=source_name)
+        
+        feed = feedparser.FeedParserDict(
+            entries=[
+                feedparser.FeedParserDict(
+                    title=title, link=link, published=published, summary=summary,
+                    clean_summary=clean, keyword_bits=bits, seen_keys=keys
+                )
+                for title, link, published, summary, clean, bits, keys in kept
+            ],
+            status=response.status_code,
+            total_entries=total,
+            already_seen=already_seen,
+            etag=response.headers.get('ETag'),
+            modified=response.headers.get('Last-Modified')
+        )
+        if error:
+            feed['bozo'], feed['bozo_exception'] = 1, error
+        
+        # Only the pre-filtered entries are cached; a 304 replays them through the normal stages
+        if self.feed_cache and feed.entries and (feed.etag or feed.modified):
+            self.feed_cache.store(feed_url, feed.etag, feed.modified, feed.entries)
+        return feed
+    
+    def parse_started(self):
+        with self._parse_guard:
+            if not self._parse_in_flight:
+                self._parse_busy_since = time.perf_counter()
+            self._parse_in_flight += 1
+    
+    def parse_finished(self):
+        """Track wall time with at least one parse in flight (the denominator of the parse speedup)"""
+        with self._parse_guard:
+            self._parse_in_flight -= 1
+            if not self._parse_in_flight:
+                self.parse_stats['busy_seconds'] += time.perf_counter() - self._parse_busy_since
+    
+    def start_parse_pool(self):
+        """Start the worker processes (each gets the compiled lexicon once, via the initializer)
+        
+        Returns True if this call started the pool, so callers only stop a pool they own.
+        """
+        if self.parse_processes <= 0 or self.parse_pool is not None:
+            return False
+        seen_db = os.path.join(self.state_dir, 'state.sqlite') if self.seen_index else None
+        # Spawned (not forked) workers: the pool starts while fetch threads may hold locks
+        self.parse_pool = ProcessPoolExecutor(
+            max_workers=self.parse_processes,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_parse_worker,
+            initargs=(
+                self.keyword_matcher.to_artifact(), sorted(self.specialized_sources),
+                sorted(self.major_sources), self.entries_per_feed, self.fast_feed_parser,
+                seen_db, self.seen_ttl_days * 86400
+            )
+        )
+        print(f"🧮 Parsing feeds in {self.parse_processes} worker processes")
+        return True
+    
+    def stop_parse_pool(self):
+        if self.parse_pool is not None:
+            self.parse_pool.shutdown(wait=False, cancel_futures=True)
+            self.parse_pool = None
+    
+    def parse_speedup(self):
+        """Process-pool parse summary for the run report: serial parse seconds over parse wall time"""
+        stats = dict(self.parse_stats, processes=self.parse_processes)
+        stats['speedup'] = round(stats['worker_seconds'] / stats['busy_seconds'], 2) if stats['busy_seconds'] else None
+        stats['worker_seconds'] = round(stats['worker_seconds'], 6)
+        stats['busy_seconds'] = round(stats['busy_seconds'], 6)
+        return stats
+    
+    # ------------------------------------------------------------------
+    # Streaming pipeline: fetch → clean → filter → dedup → score → top-K per category
+    # Each stage is a generator, so articles flow through one at a time.
+    # ------------------------------------------------------------------
+    
+    def stream_feeds(self, feeds=None):
+        """Yield (source_name, feed) for every feed (or the given subset) as soon as it arrives"""
+        feeds = self.financial_feeds if feeds is None else feeds
+        started = time.monotonic()
+        
+        # Sources that keep failing are skipped until their next probe time
+        sources = {}
+        for source_name, feed_url in feeds.items():
+            if self.feed_health and self.feed_health.is_open(source_name):
+                probe_at = datetime.fromtimestamp(self.feed_health.get(source_name)['open_until'])
+                print(f"⛔ {source_name} circuit open, next probe after {probe_at:%Y-%m-%d %H:%M}")
+                continue
+            sources[source_name] = feed_url
+        
+        # Fetch every feed in parallel; wall-clock is bounded by the slowest feed (or the deadline)
+        # The daemon keeps one pool for its lifetime; a one-off run starts and stops its own
+        owns_pool = self.start_parse_pool()
+        executor = ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix='feed')
+        futures = {
+            executor.submit(self.fetch_feed, source_name, feed_url): source_name
+            for source_name, feed_url in sources.items()
+        }
+        
+        try:
+            for future in as_completed(futures, timeout=self.fetch_deadline):
+                source_name = futures[future]
+                try:
+                    feed = future.result()
+                except Exception as e:
+                    print(f"❌ Error fetching from {source_name}: {e}")
+                    continue
+                if feed is not None:
+                    yield source_name, feed
+        
+        except FuturesTimeoutError:
+            pending = [name for future, name in futures.items() if not future.done()]
+            print(f"⏱️ Fetch deadline ({self.fetch_deadline:.0f}s) reached, skipping: {', '.join(pending)}")
+        
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            if owns_pool:
+                self.stop_parse_pool()
+            print(f"📰 Fetched {len(sources)} feeds in {time.monotonic() - started:.1f}s")
+            if self.parse_processes > 0 and self.parse_stats['documents']:
+                stats = self.parse_speedup()
+                print(f"🧮 Parsed {stats['documents']} feeds: {stats['worker_seconds']:.2f}s of parsing "
+                      f"in {stats['busy_seconds']:.2f}s wall ({stats['speedup']}x)")
+    
+    def stream_entries(self, feeds):
+        """Yield (source_name, entry) for the leading entries of each feed, minus already-sent stories"""
+        for source_name, feed in feeds:
+            # Entries parsed in the process pool were already checked against the index there
+            already_seen = feed.get('already_seen', 0)
+            if not feed.entries:
+                if already_seen:
+                    print(f"♻️ Skipped {already_seen} already-sent stories from {source_name}")
+                elif feed.get('total_entries'):
+                    print(f"✅ Fetched {feed.total_entries} articles from {source_name}, none relevant")
                 else:
                     print(f"⚠️ No articles found from {source_name}")
-                    
-                time.sleep(0.8)  # Slightly longer delay for premium sources
+                continue
+            
+            if 'total_entries' in feed:
+                print(f"✅ Fetched {feed.total_entries} articles from {source_name}, {len(feed.entries)} relevant")
+            else:
+                print(f"✅ Fetched {len(feed.entries)} articles from {source_name}")
+            
+            for entry in feed.entries[:self.entries_per_feed]:  # More articles for better filtering
+                if not entry.get('title'):
+                    continue
+                
+                # Skip stories mailed in a previous issue before doing any work on them
+                if self.seen_index:
+                    seen_keys = entry.get('seen_keys') or self.seen_index.keys_for(
+                        entry.get('link'), entry.title, entry.get('summary', '')
+                    )
+                    if self.seen_index.is_seen(seen_keys):
+                        already_seen += 1
+                        continue
+                    entry['seen_keys'] = seen_keys
                 
+                self.metrics.count('articles_out', stage='fetch')
+                yield source_name, entry
+            
+            if already_seen:
+                self.metrics.count('cache_hits', already_seen, cache='seen')
+                print(f"♻️ Skipped {already_seen} already-sent stories from {source_name}")
+    
+    def clean_stage(self, entries):
+        """Turn raw feed entries into Articles with a cleaned summary"""
+        for source_name, entry in entries:
+            self.metrics.count('articles_in', stage='clean')
+            try:
+                with self.metrics.span('clean'):
+                    # Entries parsed in the process pool arrive already cleaned and keyword-matched
+                    clean = entry.get('clean_summary')
+                    article = Article(
+                        entry.title,
+                        self.clean_summary(entry.get('summary', entry.title)) if clean is None else clean,
+                        link=entry.get('link', ''),
+                        source=source_name,
+                        published=entry.get('published', 'Recent'),
+                        priority=self.get_source_priority(source_name),
+                        seen_keys=entry.get('seen_keys')
+                    )
+                    if 'keyword_bits' in entry:
+                        article.keyword_hits = KeywordHits(entry.keyword_bits, self.keyword_matcher.label_masks)
             except Exception as e:
-                print(f"❌ Error fetching from {source_name}: {e}")
-                # Try alternative RSS paths for some sources
-                alternative_url = self.get_alternative_rss(source_name, feed_url)
-                if alternative_url:
-                    try:
-                        feed = feedparser.parse(alternative_url, request_headers=headers)
-                        print(f"✅ Using alternative RSS for {source_name}")
-                        # Process alternative feed...
-                    except:
-                        print(f"❌ Alternative RSS also failed for {source_name}")
+                print(f"⚠️ Skipping malformed entry from {source_name}: {e}")
+                continue
+            self.metrics.count('articles_out', stage='clean')
+            yield article
+    
+    def filter_stage(self, articles):
+        """Keep PE/VC relevant articles; the keyword hits are kept for categorization and scoring"""
+        for article in articles:
+            self.metrics.count('articles_in', stage='filter')
+            with self.metrics.span('filter'):
+                # One keyword pass shared by filtering, categorization and scoring
+                hits = article.keyword_hits or self.keyword_matcher.match(article.text)
+                
+                # Filter for PE/VC relevance (more lenient for specialized sources)
+                relevant = self.is_pe_vc_relevant(article.text, article.source, hits)
+            
+            if relevant:
+                article.keyword_hits = hits
+                self.metrics.count('articles_out', stage='filter')
+                yield article
+    
+    def dedup_stage(self, articles, index=None, representatives=None):
+        """Drop near-duplicates as they stream past (a copy from a higher-priority source supersedes the earlier one)
+        
+        Pass a long-lived index and representatives dict to deduplicate across runs (daemon mode).
+        """
+        if index is None:
+            index = NearDuplicateIndex()
+        if representatives is None:
+            representatives = {}
+        
+        for article in articles:
+            self.metrics.count('articles_in', stage='dedup')
+            with self.metrics.span('dedup'):
+                signature = index.signature(article.text)
+                cluster = index.find(signature)
+                
+                # A cluster is indexed by its first story only; copies must resemble that story
+                keep = True
+                if cluster is None:
+                    cluster = len(representatives)
+                    index.add(cluster, signature)
+                    representatives[cluster] = article
+                else:
+                    current = representatives[cluster]
+                    keep = article.priority > current.priority
+                    if keep:
+                        # Already yielded, so flag it for later stages to drop (selection hands its slot on)
+                        current.superseded = True
+                        article.supersedes = current
+                        article.duplicate_keys = tuple(WarmArticlePool.article_keys(current)) + current.duplicate_keys
+                        representatives[cluster] = article
+                    else:
+                        # Mailing the representative must also mark this copy as seen, or it leads the next issue
+                        current.duplicate_keys += tuple(WarmArticlePool.article_keys(article)) + article.duplicate_keys
+            
+            if keep:
+                self.metrics.count('articles_out', stage='dedup')
+                yield article
+    
+    def enrich_stage(self, articles):
+        """Fetch the pages of thin-summary articles concurrently and rescan them with the page text
+        
+        Runs after filtering and dedup, so only surviving candidates are fetched. Order is kept:
+        articles leave through a bounded window as soon as their own fetch is done.
+        """
+        executor = ThreadPoolExecutor(max_workers=self.enrich_workers, thread_name_prefix='enrich')
+        window = deque()
+        budget = self.enrich_max_articles
+        
+        try:
+            for article in articles:
+                self.metrics.count('articles_in', stage='enrich')
+                future = None
+                if budget > 0 and article.link and len(article.summary) < self.enrich_min_summary:
+                    budget -= 1
+                    future = executor.submit(self.fetch_article_text, article.link)
+                window.append((article, future))
+                
+                while window and (len(window) > 2 * self.enrich_workers or window[0][1] is None or window[0][1].done()):
+                    yield self.apply_enrichment(*window.popleft())
+            
+            while window:
+                yield self.apply_enrichment(*window.popleft())
+        
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def apply_enrichment(self, article, future):
+        body = future.result() if future is not None else ''
+        if body:
+            article.enrich(body)
+            article.keyword_hits = self.keyword_matcher.match(article.text)
+            self.metrics.count('articles_enriched')
+        self.metrics.count('articles_out', stage='enrich')
+        return article
+    
+    def fetch_article_text(self, url):
+        """Lead text of one article page, from the cache or a size-capped download; '' if none"""
+        if self.article_text_cache:
+            cached = self.article_text_cache.get(url)
+            if cached is not None:
+                self.metrics.count('cache_hits', cache='article_text')
+                return cached
+            self.metrics.count('cache_misses', cache='article_text')
+        
+        try:
+            with self.metrics.span('enrich', host=urlparse(url).netloc.lower()):
+                response = self.http.get(
+                    url, headers={'Accept': 'text/html,application/xhtml+xml'},
+                    max_bytes=self.enrich_max_bytes, timeout=self.enrich_timeout
+                )
+            self.metrics.count('bytes_downloaded', response.wire_bytes, kind='articles')
+            if response.status_code == 408 or response.status_code in HttpTransport.RETRY_STATUSES:
+                # Transient failures (still failing after the transport's retries) are not cached
+                print(f"⚠️ Could not enrich {url}: HTTP {response.status_code}")
+                return ''
+            content_type = response.headers.get('content-type', 'text/html')
+            if response.status_code != 200 or 'html' not in content_type:
+                # Paywalls, 404s and PDFs are remembered as empty so they are not retried every run
+                text = ''
+            else:
+                text = self.extract_lead_text(response.content)
+        except Exception as e:
+            # Transient failures are not cached
+            print(f"⚠️ Could not enrich {url}: {e}")
+            return ''
+        
+        if self.article_text_cache:
+            self.article_text_cache.store(url, text)
+        return text
+    
+    def extract_lead_text(self, content):
+        """First few substantial paragraphs of a page (the meta description if there are none)"""
+        soup = bs4.BeautifulSoup(content, self.html_parser)
+        for tag in soup(['script', 'style', 'nav', 'header', 'footer', 'aside', 'form', 'figure']):
+            tag.decompose()
+        
+        container = soup.find('article') or soup.body or soup
+        paragraphs = []
+        for paragraph in container.find_all('p'):
+            text = ' '.join(paragraph.get_text(' ', strip=True).split())
+            if len(text) >= 60:  # Skip bylines, captions and share prompts
+                paragraphs.append(text)
+                if len(paragraphs) >= self.enrich_paragraphs:
+                    break
+        
+        if not paragraphs:
+            meta = soup.find('meta', attrs={'name': 'description'}) or soup.find('meta', attrs={'property': 'og:description'})
+            if meta and meta.get('content'):
+                paragraphs.append(' '.join(meta['content'].split()))
+        
+        return ' '.join(paragraphs)[:1500]
+    
+    def score_stage(self, articles, batch_size=64):
+        """Categorize and score articles in small batches (keeps scoring vectorized, memory bounded)"""
+        batch = []
+        for article in articles:
+            batch.append(article)
+            if len(batch) >= batch_size:
+                yield from self.score_batch(batch)
+                batch = []
+        if batch:
+            yield from self.score_batch(batch)
+    
+    def score_batch(self, batch):
+        self.metrics.count('articles_in', len(batch), stage='score')
+        with self.metrics.span('score'):
+            scores, _ = self.score_articles(batch)
+            for article, score in zip(batch, scores):
+                article.score = score
+                article.category = self.categorize_article(article.text, article.keyword_hits)
+        self.metrics.count('articles_out', len(batch), stage='score')
+        return batch
+    
+    def select_by_category(self, articles, quotas=None, max_articles=None, scores=None):
+        """Keep the best articles per category with one bounded heap per quota (O(n log k))
+        
+        scores, if given, replaces article.score (used for per-profile re-ranking).
+        """
+        quotas = quotas or self.category_quotas
+        heaps = {}
+        held = {}  # article -> category of the heap holding it
+        
+        for sequence, article in enumerate(articles):
+            # Ties go to the article that arrived first
+            score = article.score if scores is None else scores[sequence]
+            item = (score, -sequence, article)
+            
+            # A copy from a better source replaces its predecessor, but competes in its own category's heap
+            if article.supersedes in held:
+                heap = heaps[held.pop(article.supersedes)]
+                heap.pop(next(position for position, entry in enumerate(heap) if entry[2] is article.supersedes))
+                heapq.heapify(heap)
+            
+            limit = quotas.get(article.category, 0)
+            if limit <= 0:
+                continue
+            heap = heaps.setdefault(article.category, [])
+            if len(heap) < limit:
+                heapq.heappush(heap, item)
+            elif item[:2] > heap[0][:2]:
+                del held[heapq.heapreplace(heap, item)[2]]
+            else:
+                continue
+            held[article] = article.category
+        
+        kept = [(item, category) for category, heap in heaps.items() for item in heap]
+        if max_articles is not None and len(kept) > max_articles:
+            kept = heapq.nlargest(max_articles, kept, key=lambda entry: entry[0][:2])
+        
+        selected = {}
+        for item, category in sorted(kept, key=lambda entry: entry[0][:2], reverse=True):
+            selected.setdefault(category, []).append(item[2])
+        
+        # Return sections in quota (render) order
+        return {category: selected[category] for category in quotas if category in selected}
+    
+    def article_stream(self):
+        """Chain the streaming stages up to scoring (top-K selection is left to the caller)"""
+        entries = self.stream_entries(self.stream_feeds())
+        articles = self.clean_stage(entries)
+        articles = self.filter_stage(articles)
+        articles = self.dedup_stage(articles)
+        if self.enrich_articles:
+            articles = self.enrich_stage(articles)
+        return self.score_stage(articles)
+    
+    def build_article_pool(self):
+        """Materialize the scored, deduplicated candidates (shared by every personalized issue)"""
+        return [article for article in self.article_stream() if not article.superseded]
+    
+    def fetch_financial_news(self, max_articles=60, pool=None):
+        """Fetch PE/VC focused financial news from premium sources (or select from a warm pool)"""
+        articles = self.article_stream() if pool is None else pool
+        categorized_articles = self.select_by_category(articles, max_articles=max_articles)
+        self.metrics.count('articles_out', sum(len(section) for section in categorized_articles.values()), stage='select')
         
-        # Sort by priority and PE/VC relevance, remove duplicates
-        unique_articles = self.remove_duplicates(all_articles)
-        pe_vc_articles = self.prioritize_pe_vc_content(unique_articles)
-        categorized_articles = self.organize_by_category(pe_vc_articles[:max_articles])
+        leaders = [section[0] for section in categorized_articles.values()]
+        if leaders:
+            top = max(leaders, key=lambda article: article.score)
+            _, breakdowns = self.score_articles([top])
+            print(f"🏆 Top story ({top.score:.0f}): {top.title[:80]} [{self.explain_score(breakdowns[0])}]")
         
         return categorized_articles
     
-    def get_alternative_rss(self, source_name, original_url):
+    def get_alternative_rss_urls(self, source_name):
         """Get alternative RSS URLs for sources that might have different paths"""
         alternatives = {
             'PE News': [
@@ -305,10 +2991,7 @@ class FinancialNewsletterBot:
             ]
         }
         
-        # Return first alternative for the source
-        if source_name in alternatives and alternatives[source_name]:
-            return alternatives[source_name][0]
-        return None
+        return list(alternatives.get(source_name, []))
         
     def get_source_priority(self, source_name):
         """Assign priority scores to sources (higher = more important)"""
@@ -331,13 +3014,14 @@ class FinancialNewsletterBot:
         }
         return priority_map.get(source_name, 5)
     
-    def clean_summary(self, summary):
+    @staticmethod
+    def clean_summary(summary):
         """Clean HTML tags and format summary"""
         if not summary:
             return ""
         
-        # Remove HTML tags
-        clean = re.sub('<.*?>', '', summary)
+        # Remove HTML tags and decode entities (the renderer escapes on output)
+        clean = html.unescape(re.sub('<.*?>', '', summary))
         # Remove extra whitespace
         clean = ' '.join(clean.split())
         # Limit length
@@ -346,269 +3030,181 @@ class FinancialNewsletterBot:
         
         return clean
     
-    def is_pe_vc_relevant(self, text, source_name):
+    def keyword_groups(self):
+        """All keyword lists the matcher should recognise, keyed by group label"""
+        groups = {
+            'pe_vc': self.pe_vc_keywords,
+            'additional': self.additional_pe_vc_terms,
+            'exclude': self.exclude_keywords,
+            'general_business': self.general_business_terms,
+            'generic_fund': self.generic_fund_keywords,
+            'generic_fund_exclusion': self.generic_fund_exclusions,
+            'geo': self.na_europe_keywords,
+            'apac': self.apac_keywords,
+            'high_priority': self.high_priority_keywords,
+            'medium_priority': self.medium_priority_keywords,
+            'firm': self.scopelp_firms,
+            'deal': self.deal_indicators,
+            'currency': self.currency_indicators,
+        }
+        for index, (category, keywords) in enumerate(self.category_keywords):
+            groups[f'category:{index}'] = keywords
+        # Profile terms ride along in the same pass, so re-ranking never rescans text
+        for index, profile in enumerate(self.profiles):
+            groups[f'profile:{index}:keyword'] = profile['keywords']
+            groups[f'profile:{index}:firm'] = profile['firms']
+        return groups
+    
+    def match_keywords(self, text):
+        """Run the shared keyword matcher once over an article's text"""
+        return self.keyword_matcher.match(text.lower())
+    
+    def is_pe_vc_relevant(self, text, source_name, hits=None):
         """Check if article is relevant to PE/VC (more lenient for specialized sources)"""
-        text_lower = text.lower()
-        
         # Specialized PE/VC sources are always relevant
-        specialized_sources = [
-            'PE News', 'Private Equity Wire', 'Private Equity International', 
-            'Buyouts Insider', 'Private Capital Journal', 'PE Hub',"Financial Times", 'Wall Street Journal',
-            'Bloomberg Markets','Reuters Business','PitchBook News', 'TechCrunch Startups', 'CNBC'    
-        ]        
-        if source_name in specialized_sources:
+        if source_name in self.specialized_sources:
             return True
         
-        # For general sources, must contain PE/VC keywords
-        pe_vc_match = any(keyword in text_lower for keyword in self.pe_vc_keywords)
-        
-        # Additional PE/VC terms for broader matching
-        additional_terms = [
-            'portfolio company', 'portco', 'growth capital', 'growth equity',
-            'limited partners', 'lp', 'gp', 'general partner', 'fund manager',
-            'dry powder', 'carried interest', 'management fee', 'irr',
-            'sponsor', 'financial sponsor', 'buyout firm', 'investment firm'
-        ]
-        additional_match = any(term in text_lower for term in additional_terms)
+        if hits is None:
+            hits = self.match_keywords(text)
         
-        # Exclude hedge fund and crypto content
-        exclude_keywords = [
-            'hedge fund', 'hedge funds', 'cryptocurrency', 'crypto', 'bitcoin', 'ethereum',
-            'forex', 'currency trading', 'commodity trading', 'derivatives', 'short selling'
-        ]
-        exclude_match = any(keyword in text_lower for keyword in exclude_keywords)
+        return self.keyword_relevance(hits, source_name in self.major_sources)
+    
+    @staticmethod
+    def keyword_relevance(hits, major_source):
+        """Relevance rule for a general (non-specialized) source, given its keyword hits"""
+        # For general sources, must contain PE/VC keywords
+        pe_vc_match = 'pe_vc' in hits
+        additional_match = 'additional' in hits
+        exclude_match = 'exclude' in hits
         
         if not (pe_vc_match or additional_match) and not exclude_match:
-            # Check if it's general business/market news for Global Markets section
-            general_business_terms = [
-                'earnings', 'revenue', 'profit', 'loss', 'stock price', 'shares',
-                'market cap', 'dividend', 'analyst', 'forecast', 'guidance',
-                'ceo', 'cfo', 'executive', 'board', 'chairman', 'director',
-                'quarterly results', 'annual report', 'financial results',
-                'market update', 'trading', 'investor', 'shareholder'
-            ]
-            general_business_match = any(term in text_lower for term in general_business_terms)
-            
             # Allow general business news from major sources for Global Markets
-            major_sources = ['Financial Times', 'Wall Street Journal', 'Bloomberg Markets', 'Bloomberg Business', 'Reuters Business', 'Reuters Markets', 'CNBC']
-            if source_name in major_sources and general_business_match:
+            if major_source and 'general_business' in hits:
                 return True
         
         return (pe_vc_match or additional_match) and not exclude_match
-    def categorize_article(self, text):
-        """Categorize articles with enhanced structure"""
-        text_lower = text.lower()
-        print(f"🔍 DEBUG - Categorizing: {text[:100]}...")
-
-        # Global Markets (broad financial markets, not PE/VC specific)
-        if any(word in text_lower for word in ['stock market', 'trading', 'index', 'bond market', 'commodity', 'currency', 'forex', 'fed', 'federal reserve', 'central bank', 'interest rate', 'inflation', 'gdp', 'economic data', 'treasury', 'yields']):
-            print(f"   → Categorized as: Global Markets")
-            return 'Global Markets'
-            
-        # Private Equity deals and buyouts
-        elif any(word in text_lower for word in ['buyout', 'lbo', 'leveraged buyout', 'take private', 'private equity', 'pe firm', 'portfolio company acquisition']):
-            return 'Private Equity'
-        
-        # Venture Capital funding rounds
-        elif any(word in text_lower for word in ['venture capital', 'vc', 'startup funding', 'series a', 'series b', 'series c', 'seed funding', 'pre-seed', 'growth round']):
-            return 'Venture Capital'
-        
-        # Private Credit and direct lending
-        elif any(word in text_lower for word in ['private credit', 'direct lending', 'credit fund', 'debt fund', 'mezzanine', 'bdc', 'business development company', 'private debt', 'credit strategy']):
-            return 'Private Credit'
-        
-        # IPOs and public offerings
-        elif any(word in text_lower for word in ['ipo', 'public offering', 'listing', 'debut', 'going public', 'spac']):
-            return 'IPOs'
-                        
-        # Bankruptcy and distressed situations
-        elif any(word in text_lower for word in ['bankruptcy', 'chapter 11', 'distressed', 'restructuring', 'liquidation', 'insolvency', 'creditor', 'debtor']):
-            return 'Bankruptcy'
-        
-        # PE Secondaries market
-        elif any(word in text_lower for word in ['secondary', 'secondaries', 'continuation fund', 'gp-led', 'lp-led', 'process sale', 'portfolio sale']):
-            return 'PE Secondaries'
-        
-        # General deal activity defaults to PE
-        elif any(word in text_lower for word in ['m&a', 'merger', 'acquisition', 'takeover', 'deal']):
-            return 'Private Equity'
-            
-        elif any(word in text_lower for word in ['mutual fund', 'etf', 'index fund', 'hedge fund', 'pension fund', 'sovereign wealth', 'lending rates', 'interest rates', 'trade deal', 'tariffs', 'china', 'fidelity', 'blackrock']) and not any(word in text_lower for word in ['private equity', 'venture capital', 'buyout', 'pe firm', 'vc firm']):
-            print(f"   → Categorized as: Global Markets (generic fund news)")
-            return 'Global Markets'
-
-        else:
-            return 'Global Markets'  # Default to markets section
     
-    def remove_duplicates(self, articles):
-        """Remove duplicate articles based on title similarity"""
-        unique_articles = []
-        seen_titles = set()
+    def categorize_article(self, text, hits=None):
+        """Categorize articles with enhanced structure"""
+        if self.debug:
+            print(f"🔍 DEBUG - Categorizing: {text[:100]}...")
         
-        for article in articles:
-            # Create a simplified title for comparison
-            simple_title = re.sub(r'[^\w\s]', '', article['title'].lower())
-            simple_title = ' '.join(simple_title.split()[:5])  # First 5 words
-            
-            if simple_title not in seen_titles:
-                seen_titles.add(simple_title)
-                unique_articles.append(article)
+        if hits is None:
+            hits = self.match_keywords(text)
+        
+        for index, (category, keywords) in enumerate(self.category_keywords):
+            if f'category:{index}' in hits:
+                if category == 'Global Markets' and self.debug:
+                    print(f"   → Categorized as: Global Markets")
+                return category
+        
+        if 'generic_fund' in hits and 'generic_fund_exclusion' not in hits:
+            if self.debug:
+                print(f"   → Categorized as: Global Markets (generic fund news)")
+            return 'Global Markets'
         
-        return unique_articles
+        return 'Global Markets'  # Default to markets section
+    
+    def remove_duplicates(self, articles):
+        """Cluster near-duplicate stories (MinHash/LSH) and keep the highest-priority source of each"""
+        unique_articles = list(self.dedup_stage(articles))
+        return [article for article in unique_articles if not article.superseded]
     
     def organize_by_category(self, articles):
         """Organize articles by category"""
         categories = {}
         for article in articles:
-            category = article['category']
+            category = article.category
             if category not in categories:
                 categories[category] = []
             categories[category].append(article)
         
         return categories
     
+    def article_features(self, article):
+        """Feature vector (ordered like self.score_features) derived from an article's keyword hits"""
+        hits = article.keyword_hits
+        if hits is None:
+            hits = article.keyword_hits = self.keyword_matcher.match(article.text)
+        
+        geographic_matches = hits.count('geo')
+        apac_matches = hits.count('apac')
+        counts = {
+            'source_priority': article.priority,
+            'geo': geographic_matches,
+            'geo_multi': 1 if geographic_matches >= 2 else 0,
+            'geo_strong': 1 if geographic_matches >= 3 else 0,
+            'apac_only': apac_matches if geographic_matches == 0 else 0,
+            'high_priority': hits.count('high_priority'),
+            'medium_priority': hits.count('medium_priority'),
+            'firm': hits.count('firm'),
+            'deal': hits.count('deal'),
+            'currency': 1 if 'currency' in hits else 0,
+        }
+        return [counts[name] for name in self.score_features]
+    
+    def score_articles(self, articles):
+        """Score a batch of articles; returns (scores, per-feature breakdowns)"""
+        # Feature vectors are cached on the articles so re-ranking never rescans text
+        for article in articles:
+            if article.features is None:
+                article.features = self.article_features(article)
+        
+        weights = [self.score_weights[name] for name in self.score_features]
+        rows = [article.features for article in articles]
+        
+        if np is not None and rows:
+            contributions = np.asarray(rows, dtype=float) * np.asarray(weights, dtype=float) + 0.0  # no -0.0
+            scores = contributions.sum(axis=1).tolist()
+            contributions = contributions.tolist()
+        else:
+            contributions = [[value * weight for value, weight in zip(row, weights)] for row in rows]
+            scores = [sum(row) for row in contributions]
+        
+        breakdowns = [dict(zip(self.score_features, row)) for row in contributions]
+        return scores, breakdowns
+    
+    def explain_score(self, breakdown, top=3):
+        """Short human-readable summary of the biggest score contributions"""
+        parts = sorted(breakdown.items(), key=lambda item: abs(item[1]), reverse=True)
+        return ', '.join(f"{name} {value:+.0f}" for name, value in parts[:top] if value)
+    
     def prioritize_pe_vc_content(self, articles):
         """Sort articles by PE/VC relevance score, source priority, and geography"""
-        def pe_vc_score(article):
-            text = (article['title'] + ' ' + article['summary']).lower()
-            score = 0
-            
-            # Source priority weight
-            score += article.get('priority', 5) * 2
-            
-            # ENHANCED Geographic priority - North America and Europe (MUCH HIGHER WEIGHT)
-            na_europe_keywords = [
-                # North America - Major cities and financial centers
-                'united states', 'u.s.', 'us ', 'usa', 'america', 'american', 'canada', 'canadian', 
-                'new york', 'nyc', 'manhattan', 'silicon valley', 'san francisco', 'bay area', 
-                'boston', 'chicago', 'los angeles', 'seattle', 'austin', 'dallas', 'houston',
-                'miami', 'atlanta', 'washington dc', 'philadelphia', 'denver', 'phoenix',
-                'toronto', 'montreal', 'vancouver', 'calgary', 'ottawa',
-                
-                # US States
-                'california', 'texas', 'florida', 'illinois', 'massachusetts', 'pennsylvania',
-                'ohio', 'michigan', 'georgia', 'north carolina', 'virginia', 'maryland',
-                
-                # Financial indicators
-                'wall street', 'nasdaq', 'nyse', 'tsx', 'sec', 'federal reserve', 'fed',
-                
-                # Europe - Major countries and cities
-                'europe', 'european', 'eu ', 'eurozone',
-                'uk', 'u.k.', 'united kingdom', 'britain', 'british', 'london', 'england', 'scotland',
-                'germany', 'german', 'berlin', 'frankfurt', 'munich', 'hamburg',
-                'france', 'french', 'paris', 'lyon', 'marseille',
-                'italy', 'italian', 'milan', 'rome', 'turin',
-                'spain', 'spanish', 'madrid', 'barcelona',
-                'netherlands', 'dutch', 'amsterdam', 'rotterdam',
-                'switzerland', 'swiss', 'zurich', 'geneva', 'basel',
-                'sweden', 'swedish', 'stockholm', 'gothenburg',
-                'norway', 'norwegian', 'oslo',
-                'denmark', 'danish', 'copenhagen',
-                'finland', 'finnish', 'helsinki',
-                'austria', 'austrian', 'vienna',
-                'belgium', 'belgian', 'brussels',
-                'ireland', 'irish', 'dublin',
-                'portugal', 'portuguese', 'lisbon',
-                'poland', 'polish', 'warsaw',
-                'luxembourg', 'czech', 'prague',
-                
-                # European financial centers and exchanges
-                'lse', 'london stock exchange', 'ftse', 'dax', 'cac', 'stoxx', 'euronext',
-                'city of london', 'canary wharf', 'la défense', 'frankfurt stock exchange'
-                
-                # Middle East - NEW ADDITION
-                'middle east', 'gulf', 'gcc', 'mena',
-                'saudi arabia', 'saudi', 'riyadh', 'jeddah', 'ksa', 'kingdom of saudi arabia',
-                'qatar', 'qatari', 'doha', 'qatar investment authority', 'qia',
-                'kuwait', 'kuwaiti', 'kuwait city', 'kic', 'kuwait investment corporation',
-                'uae', 'united arab emirates', 'dubai', 'abu dhabi', 'emirates', 'emirati',
-                'adia', 'abu dhabi investment authority', 'mubadala', 'emirates investment authority',
-                'sovereign wealth fund', 'swf', 'pension investment corporation', 'pic',
-                'aramco', 'saudi aramco', 'adnoc', 'emirates nbd', 'first abu dhabi bank',
-                'qatar national bank', 'qnb', 'national bank of kuwait', 'nbk'
-            ]
-            
-            # Count geographic matches with MUCH higher weight (10 points each instead of 3)
-            geographic_matches = sum(1 for keyword in na_europe_keywords if keyword in text)
-            geographic_bonus = geographic_matches * 10  # Increased from 3 to 10
-            score += geographic_bonus
-            
-            # Additional boost for multiple geographic references (compound effect)
-            if geographic_matches >= 2:
-                score += 20  # Extra bonus for multiple location mentions
-            if geographic_matches >= 3:
-                score += 30  # Even more for very location-specific articles
-            
-            # PENALTY for Asia-Pacific and other regions (negative scoring)
-            apac_keywords = [
-                'china', 'chinese', 'beijing', 'shanghai', 'shenzhen', 'hong kong',
-                'japan', 'japanese', 'tokyo', 'osaka',
-                'singapore', 'singaporean',
-                'india', 'indian', 'mumbai', 'delhi', 'bangalore',
-                'australia', 'australian', 'sydney', 'melbourne',
-                'korea', 'korean', 'seoul',
-                'indonesia', 'jakarta', 'thailand', 'bangkok',
-                'malaysia', 'kuala lumpur', 'vietnam', 'philippines',
-                'africa', 'african', 'south africa', 'nigeria', 'kenya',
-                'latin america', 'brazil', 'brazilian', 'mexico', 'mexican',
-                'argentina', 'chile', 'colombia'
-            ]
-            
-            # Apply penalty for non-NA/EU content
-            apac_matches = sum(1 for keyword in apac_keywords if keyword in text)
-            if apac_matches > 0 and geographic_matches == 0:
-                score -= (apac_matches * 15)  # Strong penalty for non-NA/EU exclusive content
-            
-            # High priority keywords
-            high_priority = [
-                'private equity', 'venture capital', 'buyout', 'funding round', 'ipo', 'acquisition',
-                'series a', 'series b', 'series c', 'growth capital', 'lbo'
-            ]
-            score += sum(8 for keyword in high_priority if keyword in text)
-            
-            # Medium priority keywords  
-            medium_priority = [
-                'investment', 'startup', 'portfolio', 'exit', 'valuation', 'fund', 'sponsor'
-            ]
-            score += sum(4 for keyword in medium_priority if keyword in text)
-            
-            # PE/VC firm names (ScopeLP monitoring list) - mostly NA/EU firms
-            scopelp_firms = [
-                '26north', 'abry', 'accel kkr', 'adia', 'advent', 'aea', 'american industrial partners',
-                'alpine', 'american securities', 'antin infra', 'apax', 'apollo', 'ares',
-                'arlington capital', 'arcline', 'bain', 'baypine', 'bc partners', 'bdt', 'msd',
-                'berkshire partners', 'blackstone', 'brightstar', 'butterfly equity', 'calera',
-                'carlyle', 'ccmp', 'cd&r', 'centerbridge', 'cerberus', 'charlesbank', 'cinven',
-                'clearlake', 'cornell capital', 'court square', 'cvc', 'elliott', 'eqt',
-                'fairfax', 'fortress', 'francisco', 'gamut', 'general atlantic', 'genstar',
-                'gi partners', 'golden gate', 'greenbriar', 'gsam', 'gtcr', 'h&f', 'haveli',
-                'harvest partners', 'hg', 'hig', 'hps', 'insight partners', 'kelso', 'kkr',
-                'kohlberg', 'kps', 'l catterton', 'leonard green', 'lindsay goldberg', 'littlejohn',
-                'lone star', 'madison dearborn', 'mubadala', 'new mountain', 'oak hill', 'oaktree',
-                'odyssey', 'olympus', 'omers', 'one rock', 'onex', 'pai', 'parthenon',
-                'partners group', 'patient square', 'permira', 'platinum', 'pritzker private capital',
-                'providence', 'reverence', 'rhône group', 'roark', 'searchlight', 'silver lake',
-                'siris capital', 'sk capital', 'stone canyon', 'stone point', 'stonepeak',
-                'summit partners', 'svp capital', 'symphony', 'ta associates', 'thoma bravo',
-                'thl', 'tjc', 'towerbrook', 'tpg', 'tpg real estate', 'truelink', 'tsg consumer',
-                'veritas', 'vista', 'warburg pincus', 'welsh carson', 'cppib', 'gryphon investors',
-                'graham partners', 'birch hill', 'torquest', 'novacap', 'oncap', 'sterling',
-                'altas', 'sagard'
-            ]
-            score += sum(15 for firm in scopelp_firms if firm in text)
-            
-            # Deal size indicators
-            deal_indicators = ['billion', 'million', 'valuation', 'fund size']
-            score += sum(3 for indicator in deal_indicators if indicator in text)
-            
-            # Currency indicators for NA/EU (bonus points)
-            currency_list = ['$', 'usd', 'dollar', 'eur', 'euro', 'gbp', 'pound']
-            if any(currency in text for currency in currency_list):
-                score += 5
-            
-            return score
+        scores, breakdowns = self.score_articles(articles)
+        for article, score in zip(articles, scores):
+            article.score = score
+        
+        order = sorted(range(len(articles)), key=lambda i: scores[i], reverse=True)
+        if order:
+            top = order[0]
+            print(f"🏆 Top story ({scores[top]:.0f}): {articles[top].title[:80]} [{self.explain_score(breakdowns[top])}]")
+        
+        return [articles[i] for i in order]
+    
+    def profile_scores(self, articles, profile_index, feature_matrix=None):
+        """Re-rank the cached feature vectors for one subscriber profile (no text is rescanned)"""
+        profile = self.profiles[profile_index]
+        multipliers = {}
+        for region, weight in profile['region_weights'].items():
+            for name in self.region_features.get(region, (region,)):
+                multipliers[name] = weight
+        weights = [self.score_weights[name] * multipliers.get(name, 1.0) for name in self.score_features]
+        
+        if feature_matrix is not None:
+            base_scores = (feature_matrix @ np.asarray(weights, dtype=float)).tolist()
+        else:
+            base_scores = [sum(value * weight for value, weight in zip(article.features, weights)) for article in articles]
         
-        return sorted(articles, key=pe_vc_score, reverse=True)
+        keyword_label = f'profile:{profile_index}:keyword'
+        firm_label = f'profile:{profile_index}:firm'
+        return [
+            score
+            + self.profile_keyword_weight * article.keyword_hits.count(keyword_label)
+            + self.profile_firm_weight * article.keyword_hits.count(firm_label)
+            for score, article in zip(base_scores, articles)
+        ]
     
     def format_market_data(self, market_data):
         """Format market data or show unavailable message"""
@@ -637,16 +3233,14 @@ class FinancialNewsletterBot:
                 trading_date = symbol_data['trading_date']
                 break
         
-        html = f"""
+        parts = [f"""
         <div style="background: #f8f9fa; padding: 20px; border-radius: 8px; margin: 20px 0;">
             <h3 style="color: #333; margin: 0 0 5px 0;">🌍 Global Markets Overview</h3>
             {f'<p style="color: #666; font-size: 12px; margin: 0 0 15px 0;">Closing prices from {trading_date}</p>' if trading_date else ''}
             <div style="display: flex; flex-wrap: wrap; gap: 15px; justify-content: space-between;">
-        """
+        """]
         
         # Enhanced market labels for global view
-        # REPLACED entire dictionary:
-
         market_labels = {
             '^GSPC': 'S&P 500',
             '^FTSE': 'FTSE 100',
@@ -686,267 +3280,104 @@ class FinancialNewsletterBot:
                     price_display = f"{price:,.2f}"
                 
                 # All symbols show YTD performance
-                html += f"""
+                parts.append(f"""
                     <div style="flex: 1; min-width: 120px; max-width: 150px; text-align: center; padding: 12px; background: white; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
                         <div style="font-weight: bold; font-size: 11px; color: #666; margin-bottom: 6px; line-height: 1.2;">{display_name}</div>
                         <div style="font-size: 16px; font-weight: 700; margin-bottom: 4px; color: #1a1a1a;">{price_display}</div>
                         <div style="color: {daily_color}; font-size: 12px; font-weight: 500; margin-bottom: 4px;">{daily_arrow} {change_pct:+.1f}%</div>
                         <div style="color: {ytd_color}; font-size: 10px; font-weight: 500;">YTD: {ytd_pct:+.1f}%</div>
                     </div>
-                """
+                """)
             else:
                 # Show placeholder for missing symbols
                 display_name = market_labels.get(symbol, symbol)
-                html += f"""
+                parts.append(f"""
                     <div style="flex: 1; min-width: 120px; max-width: 150px; text-align: center; padding: 12px; background: white; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); opacity: 0.5;">
                         <div style="font-weight: bold; font-size: 11px; color: #666; margin-bottom: 6px; line-height: 1.2;">{display_name}</div>
                         <div style="font-size: 14px; color: #999;">N/A</div>
                     </div>
-                """
+                """)
         
-        html += "</div></div>"
+        parts.append("</div></div>")
         print("✅ Market data formatted successfully")
-        return html
+        return ''.join(parts)
     
     def create_newsletter_html(self, categorized_articles, market_data):
         """Create ExecSum-style HTML newsletter"""
+        return self.render_newsletter_variants({'default': categorized_articles}, market_data)['default']
+    
+    def render_newsletter_variants(self, variants, market_data, quotas_by_variant=None):
+        """Render several issues (e.g. one per recipient) sharing the head, market block and footer"""
+        quotas_by_variant = quotas_by_variant or {}
         current_date = datetime.now().strftime("%B %d, %Y")
         
-        # Count total articles
-        total_articles = sum(len(articles) for articles in categorized_articles.values())
+        # Shared parts are rendered once for every variant
+        shared_head = []
+        NEWSLETTER_HEAD.render_into(shared_head, date=current_date)
+        shared_head = ''.join(shared_head)
+        market_html = self.format_market_data(market_data)
         
-        html_content = f"""
-        <html>
-        <head>
-            <style>
-                body {{ 
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                    max-width: 680px; 
-                    margin: 0 auto; 
-                    background: #ffffff;
-                    color: #333;
-                    line-height: 1.6;
-                }}
-                .header {{
-                    text-align: center;
-                    padding: 30px 20px;
-                    border-bottom: 1px solid #e1e8ed;
-                }}
-                .header h1 {{
-                    font-size: 28px;
-                    color: #1a1a1a;
-                    margin: 0 0 10px 0;
-                    font-weight: 700;
-                }}
-                .date {{
-                    color: #657786;
-                    font-size: 14px;
-                }}
-                .greeting {{
-                    padding: 20px;
-                    background: #f8f9fa;
-                    margin: 0;
-                    font-size: 16px;
-                }}
-                .section {{
-                    margin: 30px 20px;
-                }}
-                .section h2 {{
-                    color: #1a1a1a;
-                    font-size: 20px;
-                    margin: 0 0 20px 0;
-                    font-weight: 600;
-                    border-bottom: 2px solid #1d9bf0;
-                    padding-bottom: 8px;
-                }}
-                .article {{
-                    margin-bottom: 20px;
-                    padding-bottom: 15px;
-                    border-bottom: 1px solid #f1f3f4;
-                }}
-                .article:last-child {{
-                    border-bottom: none;
-                }}
-                .article-title {{
-                    font-weight: 600;
-                    font-size: 16px;
-                    margin: 0 0 8px 0;
-                    color: #1a1a1a;
-                }}
-                .article-summary {{
-                    color: #536471;
-                    margin: 8px 0 12px 0;
-                    font-size: 14px;
-                }}
-                .article-meta {{
-                    font-size: 12px;
-                    color: #8b98a5;
-                    display: flex;
-                    justify-content: space-between;
-                    align-items: center;
-                }}
-                .read-more {{
-                    color: #1d9bf0;
-                    text-decoration: none;
-                    font-weight: 500;
-                    font-size: 13px;
-                }}
-                .read-more:hover {{
-                    text-decoration: underline;
-                }}
-                .bullet-list {{
-                    list-style-type: none;
-                    padding: 0;
-                    margin: 0;
-                }}
-                .bullet-list li {{
-                    margin-bottom: 15px;
-                    padding-left: 20px;
-                    position: relative;
-                    font-size: 15px;
-                    line-height: 1.5;
-                }}
-                .bullet-list li:before {{
-                    content: "•";
-                    position: absolute;
-                    left: 0;
-                    font-weight: bold;
-                    font-size: 18px;
-                }}
-                .bullet-list a {{
-                    color: #1d9bf0;
-                    text-decoration: none;
-                    font-size: 13px;
-                    font-weight: 500;
-                }}
-                .bullet-list a:hover {{
-                    text-decoration: underline;
-                }}
-                .footer {{
-                    text-align: center;
-                    padding: 30px 20px;
-                    border-top: 1px solid #e1e8ed;
-                    color: #8b98a5;
-                    font-size: 12px;
-                }}
-                .category-divider {{
-                    margin: 40px 0 30px 0;
-                    text-align: center;
-                }}
-                .category-divider::before {{
-                    content: '';
-                    display: inline-block;
-                    width: 50px;
-                    height: 1px;
-                    background: #e1e8ed;
-                    margin-right: 15px;
-                    vertical-align: middle;
-                }}
-                .category-divider::after {{
-                    content: '';
-                    display: inline-block;
-                    width: 50px;
-                    height: 1px;
-                    background: #e1e8ed;
-                    margin-left: 15px;
-                    vertical-align: middle;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>📡 ScopeSignal by ScopeLP</h1>
-                <div class="date">{current_date}</div>
-            </div>
-            
-            <div class="greeting">
-                <strong>Good Morning,</strong><br><br>
-                Today's brief covers {total_articles} key stories across global markets and private capital deals. 
-                Market data reflects closing prices from the most recent trading session.
-            </div>
-            
-            {self.format_market_data(market_data)}
-        """
+        rendered = {}
+        for name, categorized_articles in variants.items():
+            with self.metrics.span('render'):
+                rendered[name] = self.render_issue(categorized_articles, shared_head, market_html, quotas_by_variant.get(name))
+        return rendered
+    
+    def render_issue(self, categorized_articles, shared_head, market_html, quotas=None):
+        """Write one issue into a list buffer and join it once at the end"""
+        quotas = quotas or self.category_quotas
+        category_order = list(quotas)
+        sections = [
+            (index, category, categorized_articles[category][:quotas[category]])
+            for index, category in enumerate(category_order)
+            if categorized_articles.get(category)
+        ]
+        total_articles = sum(len(articles) for _, _, articles in sections)
         
-        # Add categorized content in new structure
-        category_order = ['Global Markets', 'Private Equity', 'Venture Capital', 'Private Credit', 'IPOs', 'Bankruptcy', 'PE Secondaries']
-        
-        for category in category_order:
-            if category in categorized_articles and categorized_articles[category]:
-                # Special handling for Global Markets section (keep original format)
-                if category == 'Global Markets':
-                    article_limit = 8  # More articles for markets overview
-                    section_description = "Global financial markets news, economic indicators, and macro trends"
-                    
-                    html_content += f"""
-                    <div class="section">
-                        <h2>{self.get_category_emoji(category)} {category}</h2>
-                        <p style="color: #666; font-size: 14px; margin: 0 0 20px 0; font-style: italic;">{section_description}</p>
-                    """
-                    
-                    # Global Markets keeps the original detailed format
-                    for article in categorized_articles[category][:article_limit]:
-                        html_content += f"""
-                        <div class="article">
-                            <div class="article-title">{article['title']}</div>
-                            <div class="article-summary">{article['summary']}</div>
-                            <div class="article-meta">
-                                <span>📍 {article['source']}</span>
-                                <a href="{article['link']}" class="read-more" target="_blank">Read more →</a>
-                            </div>
-                        </div>
-                        """
-                    
-                    html_content += "</div>"
-                
-                else:
-                    # All other sections use bullet point format
-                    article_limit = 12  # Standard limit for deal sections
-                    section_description = ""
-                    
-                    html_content += f"""
-                    <div class="section">
-                        <h2>{self.get_category_emoji(category)} {category}</h2>
-                    """
-                    
-                    # Add section description if available
-                    if section_description:
-                        html_content += f"""
-                        <p style="color: #666; font-size: 14px; margin: 0 0 20px 0; font-style: italic;">{section_description}</p>
-                        """
-                    
-                    # Bullet point format for PE and subsequent sections
-                    html_content += '<ul class="bullet-list">'
-                    
-                    for article in categorized_articles[category][:article_limit]:
-                        # Extract key information from title/summary for concise bullet
-                        bullet_text = article['title']
-                        if len(bullet_text) > 120:
-                            bullet_text = bullet_text[:117] + "..."
-                        
-                        html_content += f"""
-                        <li>
-                            {bullet_text} 
-                            <a href="{article['link']}" target="_blank">[{article['source']}]</a>
-                        </li>
-                        """
-                    
-                    html_content += '</ul></div>'
-                
-                # Add divider between categories (except last one)
-                if category != category_order[-1] and category_order.index(category) < len(category_order) - 1:
-                    html_content += '<div class="category-divider"></div>'
+        out = [shared_head]
+        NEWSLETTER_GREETING.render_into(out, total_articles=str(total_articles))
+        out.append(market_html)
         
-        html_content += """
-            <div class="footer">
-                <p>📊 ScopeSignal by ScopeLP - Private Equity Intelligence<br>
-                Automated monitoring and analysis for PE professionals.</p>
-            </div>
-        </body>
-        </html>
-        """
+        for index, category, articles in sections:
+            SECTION_OPEN.render_into(out, emoji=self.get_category_emoji(category), category=html.escape(category))
+            
+            if category == 'Global Markets':
+                # Global Markets keeps the original detailed format
+                SECTION_DESCRIPTION.render_into(
+                    out, description="Global financial markets news, economic indicators, and macro trends"
+                )
+                for article in articles:
+                    ARTICLE_CARD.render_into(
+                        out,
+                        title=html.escape(article.title, quote=False),
+                        summary=html.escape(article.summary, quote=False),
+                        source=html.escape(article.source, quote=False),
+                        link=html.escape(article.link, quote=True)
+                    )
+                out.append("</div>")
+            
+            else:
+                # Bullet point format for PE and subsequent sections
+                out.append('<ul class="bullet-list">')
+                for article in articles:
+                    # Extract key information from title/summary for concise bullet
+                    bullet_text = article.title
+                    if len(bullet_text) > 120:
+                        bullet_text = bullet_text[:117] + "..."
+                    BULLET_ITEM.render_into(
+                        out,
+                        title=html.escape(bullet_text, quote=False),
+                        source=html.escape(article.source, quote=False),
+                        link=html.escape(article.link, quote=True)
+                    )
+                out.append('</ul></div>')
+            
+            # Add divider between categories (except after the last one in the order)
+            if index < len(category_order) - 1:
+                out.append(CATEGORY_DIVIDER)
         
-        return html_content
+        out.append(NEWSLETTER_FOOTER)
+        return ''.join(out)
     
     def get_category_emoji(self, category):
         """Get emoji for deal-focused categories"""
@@ -961,107 +3392,433 @@ class FinancialNewsletterBot:
         }
         return emojis.get(category, '📰')
     
-    def send_email(self, html_content, categorized_articles):
-        """Send the newsletter email via PrivateEmail.com with punchy subject"""
-        try:
-            # Debug info
-            print(f"📧 Email Configuration:")
-            print(f"   From: {self.sender_email}")
-            print(f"   To: {self.recipient_email}")
-            print(f"   Password: {'*' * len(self.sender_password) if self.sender_password else 'NOT SET'}")
-    
-            if not self.sender_email or not self.sender_password or not self.recipient_email:
-                print("❌ ERROR: Email credentials not properly set!")
-                return
+    def build_subject(self, categorized_articles):
+        """🔥 Generate punchy subject line from top article"""
+        top_article = None
+        for cat in ['Private Equity', 'Venture Capital', 'Global Markets']:
+            if cat in categorized_articles and categorized_articles[cat]:
+                top_article = categorized_articles[cat][0]
+                break
+        
+        if top_article:
+            return f"{top_article.title} | ScopeSignal"
+        return f"ScopeSignal | {datetime.now().strftime('%B %d, %Y')}"
     
-            # 🔥 Generate punchy subject line from top article
-            top_article = None
-            for cat in ['Private Equity', 'Venture Capital', 'Global Markets']:
-                if cat in categorized_articles and categorized_articles[cat]:
-                    top_article = categorized_articles[cat][0]
-                    break
+    def build_message(self, subject_line, html_content, recipient):
+        """Create the email message for one recipient"""
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.text import MIMEText
+        
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject_line
+        msg['From'] = self.sender_email
+        msg['To'] = recipient
+        
+        html_part = MIMEText(html_content, 'html')
+        msg.attach(html_part)
+        return msg
     
-            if top_article:
-                subject_line = f"{top_article['title']} | ScopeSignal"
-            else:
-                subject_line = f"ScopeSignal | {datetime.now().strftime('%B %d, %Y')}"
+    def email_configured(self, recipients=None):
+        """Check sender credentials and recipients (a SMTP_SERVER override may not need a password)"""
+        recipients = self.recipients if recipients is None else recipients
+        print(f"📧 Email Configuration:")
+        print(f"   From: {self.sender_email}")
+        print(f"   To: {', '.join(recipients) if recipients else None}")
+        print(f"   Password: {'*' * len(self.sender_password) if self.sender_password else 'NOT SET'}")
+        
+        if not self.sender_email or not recipients or not (self.sender_password or os.getenv('SMTP_SERVER')):
+            print("❌ ERROR: Email credentials not properly set!")
+            return False
+        return True
     
+    def send_email(self, html_content, categorized_articles):
+        """Send the newsletter email via PrivateEmail.com with punchy subject"""
+        try:
+            if not self.email_configured():
+                return False
+            
+            subject_line = self.build_subject(categorized_articles)
             print(f"📨 Email Subject: {subject_line}")
-    
-            # Create email message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject_line
-            msg['From'] = self.sender_email
-            msg['To'] = self.recipient_email
-    
-            html_part = MIMEText(html_content, 'html')
-            msg.attach(html_part)
-    
-            # Try multiple SMTP configs
-            smtp_configs = [
-                ('mail.privateemail.com', 587, True),
-                ('mail.privateemail.com', 465, False),
-                ('smtp.privateemail.com', 587, True),
-                ('smtp.privateemail.com', 465, False),
+            
+            messages = [
+                (recipient, self.build_message(subject_line, html_content, recipient))
+                for recipient in self.recipients
             ]
-    
-            for server, port, use_starttls in smtp_configs:
-                try:
-                    print(f"🔄 Trying SMTP: {server}:{port} (STARTTLS: {use_starttls})")
-                    if use_starttls:
-                        smtp_server = smtplib.SMTP(server, port, timeout=30)
-                        smtp_server.starttls()
-                        smtp_server.login(self.sender_email, self.sender_password)
-                        smtp_server.send_message(msg)
-                        smtp_server.quit()
-                    else:
-                        smtp_server = smtplib.SMTP_SSL(server, port, timeout=30)
-                        smtp_server.login(self.sender_email, self.sender_password)
-                        smtp_server.send_message(msg)
-                        smtp_server.quit()
-    
-                    print(f"✅ Email sent successfully via {server}:{port}")
-                    return
-    
-                except smtplib.SMTPException as e:
-                    print(f"❌ SMTP error on {server}:{port}: {e}")
-                    continue
-    
+            return self.deliver(messages)
+        
         except Exception as e:
             print(f"❌ Error preparing email: {e}")
             import traceback
             traceback.print_exc()
+        
+        return False
+    
+    def deliver(self, messages):
+        """Send (recipient, message) pairs over pooled SMTP connections; True if anyone received it"""
+        delivery = SmtpDelivery(
+            self.sender_email,
+            self.sender_password,
+            self.smtp_endpoints,
+            state_path=os.path.join(self.state_dir, 'smtp.json'),
+            concurrency=self.smtp_concurrency
+        )
+        with self.metrics.span('send'):
+            failed = delivery.send_batch(messages)
+        
+        delivered = len(messages) - len(failed)
+        self.metrics.count('emails_sent', delivered)
+        self.metrics.count('emails_failed', len(failed))
+        if failed:
+            print(f"❌ Could not deliver to {len(failed)} recipient(s): {', '.join(failed)}")
+        print(f"✅ Email delivered to {delivered}/{len(messages)} recipient(s)")
+        return delivered > 0
+    
+    def mark_articles_sent(self, categorized_articles, quotas=None):
+        """Record every mailed story (and the near-duplicate copies it stood for) in the seen-article index
+        
+        Returns the story keys even with the index disabled: the daemon drops them from its pool.
+        """
+        quotas = quotas or self.category_quotas
+        keys = [
+            key
+            for category, articles in categorized_articles.items()
+            for article in articles[:quotas.get(category, 0)]
+            for key in tuple(WarmArticlePool.article_keys(article)) + article.duplicate_keys
+        ]
+        if self.seen_index:
+            self.seen_index.mark_seen(keys)
+            print(f"🗂️ Marked {len(keys)} story keys as sent")
+        return keys
 
-    def generate_and_send_newsletter(self):
-        """Main function to create and send newsletter"""
+    def run_once(self):
+        """Generate and send one issue, then write the run report"""
+        with self.metrics.span('run'):
+            self.generate_and_send_newsletter()
+        self.write_run_report()
+    
+    def write_run_report(self):
+        """Write the JSON run report (and Prometheus text if configured) with a one-line stage summary"""
+        report = self.metrics.report()
+        report['deferred_imports'] = {name: round(seconds, 6) for name, seconds in LAZY_IMPORT_TIMES.items()}
+        if self.parse_processes > 0:
+            report['parse_pool'] = self.parse_speedup()
+        
+        stages = {}
+        for span in report['spans']:
+            count, total = stages.get(span['name'], (0, 0.0))
+            stages[span['name']] = (count + span['count'], total + span['total_seconds'])
+        print("📈 Stages: " + ', '.join(f"{name} {total:.2f}s ({count}x)" for name, (count, total) in stages.items()))
+        
+        outputs = [(self.run_report_path, json.dumps(report, indent=2))]
+        if self.prometheus_path:
+            outputs.append((self.prometheus_path, self.metrics.prometheus()))
+        
+        for path, content in outputs:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                # Atomic replace so scrapers never read a half-written file
+                with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                    f.write(content)
+                os.replace(path + '.tmp', path)
+                print(f"📈 Run report written to {path}")
+            except OSError as e:
+                print(f"⚠️ Could not write run report {path}: {e}")
+    
+    def archive_issue(self, categorized_articles, quotas=None, variant='default', subject_line=None):
+        """Store the mailed articles (with their matched firms) in the issue archive"""
+        if not self.issue_archive:
+            return
+        quotas = quotas or self.category_quotas
+        rows = [
+            (article, self.keyword_matcher.matched_terms(article.keyword_hits, 'firm') if article.keyword_hits else [])
+            for category, articles in categorized_articles.items()
+            for article in articles[:quotas.get(category, 0)]
+        ]
+        try:
+            added = self.issue_archive.add_issue(variant, subject_line, rows)
+            print(f"🗄️ Archived {added} new stories from the {variant} issue")
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not archive the {variant} issue: {e}")
+    
+    def search_archive(self, query=None, firm=None, category=None, since=None, until=None, limit=50):
+        """Search sent issues; a firm the keyword lists don't know is searched as a text phrase instead"""
+        if not self.issue_archive:
+            return []
+        phrase = None
+        if firm:
+            firm = ' '.join(firm.lower().split())
+            if 'firm' not in self.keyword_matcher.labels_by_term.get(firm, ()):
+                phrase, firm = firm, None
+        if category:
+            # Accept any capitalization of a known category
+            category = next((name for name in self.category_quotas if name.lower() == category.lower()), category)
+        try:
+            return self.issue_archive.search(query, firm, category, since, until, limit, phrase=phrase)
+        except sqlite3.Error as e:
+            print(f"⚠️ Archive search failed: {e}")
+            return []
+    
+    def generate_and_send_newsletter(self, pool=None, market_data=None):
+        """Main function to create and send newsletter; returns the story keys marked as sent
+        
+        pool/market_data let the daemon send from data it already holds.
+        """
         print("📊 Generating NewsBrief by ScopeLP...")
         
         # Fetch market data
-        market_data = self.get_market_data()
+        if market_data is None:
+            market_data = self.get_market_data()
+        
+        if self.profiles:
+            return self.generate_and_send_personalized(market_data, pool=pool)
         
         # Fetch financial news
-        categorized_articles = self.fetch_financial_news()
+        categorized_articles = self.fetch_financial_news(pool=pool)
         
         if categorized_articles:
             html_content = self.create_newsletter_html(categorized_articles, market_data)
-            self.send_email(html_content, categorized_articles)
+            if self.send_email(html_content, categorized_articles):
+                self.archive_issue(categorized_articles, subject_line=self.build_subject(categorized_articles))
+                return self.mark_articles_sent(categorized_articles)
         else:
             print("⚠️ No articles found. Newsletter not sent.")
+        return []
+    
+    def generate_and_send_personalized(self, market_data, max_articles=60, pool=None):
+        """One fetch + scoring pass, then a cheap re-rank and render per subscriber profile"""
+        if pool is None:
+            pool = self.build_article_pool()
+        if not pool:
+            print("⚠️ No articles found. Newsletter not sent.")
+            return []
+        
+        feature_matrix = np.asarray([article.features for article in pool], dtype=float) if np is not None else None
+        variants, quotas_by_variant, recipients_by_variant = {}, {}, {}
+        
+        for index, profile in enumerate(self.profiles):
+            name = f"profile:{profile['name']}"
+            scores = self.profile_scores(pool, index, feature_matrix)
+            variants[name] = self.select_by_category(pool, profile['category_quotas'], max_articles, scores)
+            quotas_by_variant[name] = profile['category_quotas']
+            recipients_by_variant[name] = profile['emails']
+        
+        # Recipients without a profile get the global issue
+        profiled = {address for emails in recipients_by_variant.values() for address in emails}
+        default_recipients = [address for address in self.recipients if address not in profiled]
+        if default_recipients:
+            variants['default'] = self.select_by_category(pool, max_articles=max_articles)
+            recipients_by_variant['default'] = default_recipients
+        
+        all_recipients = [address for emails in recipients_by_variant.values() for address in emails]
+        if not self.email_configured(all_recipients):
+            return []
+        
+        rendered = self.render_newsletter_variants(variants, market_data, quotas_by_variant)
+        print(f"🧩 Rendered {len(rendered)} issue variants from {len(pool)} candidate articles")
+        
+        messages, subjects = [], {}
+        for name, html_content in rendered.items():
+            subject_line = subjects[name] = self.build_subject(variants[name])
+            print(f"📨 {name} subject: {subject_line}")
+            for recipient in recipients_by_variant[name]:
+                messages.append((recipient, self.build_message(subject_line, html_content, recipient)))
+        
+        sent_keys = []
+        if self.deliver(messages):
+            for name, categorized_articles in variants.items():
+                self.archive_issue(categorized_articles, quotas_by_variant.get(name), name, subjects[name])
+                sent_keys += self.mark_articles_sent(categorized_articles, quotas_by_variant.get(name))
+        return sent_keys
+    
+    # ------------------------------------------------------------------
+    # Daemon mode: incremental polling into a warm pool, send at send_time
+    # ------------------------------------------------------------------
+    
+    def poll_interval(self, source_name):
+        """Seconds between polls: specialized deal sources twice as often, general outlets half as often"""
+        minutes = self.daemon_poll_minutes
+        if source_name in self.specialized_sources:
+            minutes /= 2
+        elif source_name not in self.major_sources:
+            minutes *= 2
+        return minutes * 60
+    
+    def refresh_pool(self, pool, feeds):
+        """Poll some sources and push only entries the pool has not seen yet through the pipeline"""
+        def unseen(entries):
+            for source_name, entry in entries:
+                if pool.is_known(entry):
+                    continue
+                pool.remember(entry)
+                yield source_name, entry
+        
+        articles = self.clean_stage(unseen(self.stream_entries(self.stream_feeds(feeds))))
+        articles = self.filter_stage(articles)
+        articles = self.dedup_stage(articles, pool.dedup_index, pool.representatives)
+        if self.enrich_articles:
+            articles = self.enrich_stage(articles)
+        added = []
+        for article in self.score_stage(articles):
+            pool.add(article)
+            added.append(article)
+        
+        live = [article for article in added if not article.superseded]
+        print(f"🔥 Pool: +{len(live)} new, {len(pool.candidates())} candidates")
+        if self.breaking_alert_score > 0:
+            self.send_breaking_alerts(live)
+        return live
+    
+    def rebuild_pool(self, pool, sent_keys=()):
+        """After a send: drop mailed and stale stories and re-index the rest"""
+        survivors = pool.reset(sent_keys)
+        # Without the seen index this is all that stops the next poll re-adding what was just mailed
+        pool.known.update(sent_keys)
+        for article in self.dedup_stage(survivors, pool.dedup_index, pool.representatives):
+            pool.articles.append(article)
+            pool.known.update(WarmArticlePool.article_keys(article))
+        print(f"🧹 Pool rebuilt: {len(pool.candidates())} carried over")
+    
+    def send_breaking_alerts(self, articles):
+        """Mail a short alert for deal stories scoring at or above BREAKING_ALERT_SCORE"""
+        breaking = [
+            article for article in articles
+            if article.score >= self.breaking_alert_score
+            and article.category != 'Global Markets' and not article.alerted
+        ]
+        if not breaking or not self.email_configured(self.alert_recipients):
+            return
+        
+        messages = []
+        for article in breaking:
+            out = []
+            NEWSLETTER_HEAD.render_into(out, date=datetime.now().strftime("%B %d, %Y %H:%M"))
+            BREAKING_ALERT_OPEN.render_into(out, category=html.escape(article.category))
+            ARTICLE_CARD.render_into(
+                out,
+                title=html.escape(article.title, quote=False),
+                summary=html.escape(article.summary, quote=False),
+                source=html.escape(article.source, quote=False),
+                link=html.escape(article.link, quote=True)
+            )
+            out.append('</div>')
+            out.append(NEWSLETTER_FOOTER)
+            html_content = ''.join(out)
+            
+            subject_line = f"🚨 {article.title} | ScopeSignal Alert"
+            print(f"🚨 Breaking ({article.score:.0f}): {article.title[:80]}")
+            for recipient in self.alert_recipients:
+                messages.append((recipient, self.build_message(subject_line, html_content, recipient)))
+            article.alerted = True
+        
+        self.deliver(messages)
+    
+    def run_daemon(self, tick=30):
+        """Poll each source on its own interval and send from the warm pool at send_time"""
+        pool = WarmArticlePool(self.pool_max_age_hours)
+        next_poll = dict.fromkeys(self.financial_feeds, 0.0)
+        market = {}
+        
+        def warm_market_data():
+            market['data'] = self.get_market_data()
+        
+        def send_from_pool():
+            started = time.monotonic()
+            market_data = market.pop('data', None)
+            with self.metrics.span('run', mode='daemon'):
+                sent_keys = self.generate_and_send_newsletter(pool=pool.candidates(), market_data=market_data)
+            print(f"⚡ Sent from warm pool in {time.monotonic() - started:.1f}s")
+            self.rebuild_pool(pool, sent_keys)
+            if self.seen_index:
+                self.seen_index.evict()
+            self.write_run_report()
+        
+        # Market data is refreshed shortly before the send so the send itself only renders
+        send_at = datetime.strptime(self.send_time, '%H:%M')
+        schedule.every().day.at((send_at - timedelta(minutes=10)).strftime('%H:%M')).do(warm_market_data)
+        schedule.every().day.at(self.send_time).do(send_from_pool)
+        print(f"🚀 ScopeSignal daemon started. Polling every ~{self.daemon_poll_minutes:.0f} min, sending at {self.send_time}")
+        
+        # One set of parse workers for the daemon's lifetime: polls don't pay for fresh interpreters
+        self.start_parse_pool()
+        try:
+            while True:
+                now = time.monotonic()
+                due = {source: self.financial_feeds[source] for source, at in next_poll.items() if at <= now}
+                if due:
+                    try:
+                        self.refresh_pool(pool, due)
+                    except Exception as e:
+                        print(f"❌ Poll failed: {e}")
+                    for source in due:
+                        next_poll[source] = time.monotonic() + self.poll_interval(source)
+                
+                schedule.run_pending()
+                time.sleep(max(1.0, min(tick, min(next_poll.values()) - time.monotonic())))
+        finally:
+            self.stop_parse_pool()
 
 def main():
+    parser = argparse.ArgumentParser(description="ScopeSignal by ScopeLP newsletter")
+    parser.add_argument('--health-report', choices=['json', 'csv'],
+                        help="print the persisted feed health report and exit")
+    parser.add_argument('--daemon', action='store_true',
+                        help="poll feeds through the day and send from the warm pool at NEWSLETTER_SEND_TIME")
+    
+    search = parser.add_argument_group("issue archive search (prints matches and exits)")
+    search.add_argument('--search', nargs='?', const='', metavar='TEXT',
+                        help="full-text query over archived titles, summaries and article text")
+    search.add_argument('--firm', help="firm name, e.g. 'thoma bravo'")
+    search.add_argument('--category', help="newsletter section, e.g. 'Private Equity'")
+    search.add_argument('--since', help="first issue date, YYYY-MM-DD")
+    search.add_argument('--until', help="last issue date, YYYY-MM-DD")
+    search.add_argument('--limit', type=int, default=50)
+    search.add_argument('--json', action='store_true', help="print matches as JSON")
+    args = parser.parse_args()
+    
+    init_started = time.perf_counter()
     newsletter_bot = FinancialNewsletterBot()
+    init_seconds = time.perf_counter() - init_started
+    newsletter_bot.metrics.observe('startup', IMPORTS_DONE - IMPORT_STARTED, phase='imports')
+    newsletter_bot.metrics.observe('startup', init_seconds, phase='init')
+    
+    if args.health_report:
+        print(newsletter_bot.feed_health_report(args.health_report))
+        return
+    
+    if args.search is not None or args.firm or args.category or args.since or args.until:
+        results = newsletter_bot.search_archive(
+            args.search, args.firm, args.category, args.since, args.until, args.limit
+        )
+        if args.json:
+            print(json.dumps(results, indent=2))
+        else:
+            for result in results:
+                print(f"{result['issue_date']}  {result['category']:<16} {result['score']:>5.0f}  {result['title']} [{result['source']}]")
+                print(f"            {result['link']}")
+            print(f"🔎 {len(results)} match(es)")
+        return
+    
+    print(f"⏱️ Startup: imports {(IMPORTS_DONE - IMPORT_STARTED) * 1000:.0f}ms, bot init {init_seconds * 1000:.0f}ms")
+    
+    if args.daemon:
+        newsletter_bot.run_daemon()
+        return
     
     # For GitHub Actions - run once
     if os.getenv('GITHUB_ACTIONS'):
-        newsletter_bot.generate_and_send_newsletter()
+        newsletter_bot.run_once()
+        if LAZY_IMPORT_TIMES:
+            print("⏱️ Deferred imports: " + ', '.join(
+                f"{name} {seconds * 1000:.0f}ms" for name, seconds in LAZY_IMPORT_TIMES.items()
+            ))
     else:
         # For local development - schedule daily
-        schedule.every().day.at("07:00").do(newsletter_bot.generate_and_send_newsletter)
+        schedule.every().day.at("07:00").do(newsletter_bot.run_once)
         
         print("🚀 ScopeSignal by ScopeLP started. Next newsletter: 7:00 AM daily")
         
         # Uncomment to test immediately:
-        # newsletter_bot.generate_and_send_newsletter()
+        # newsletter_bot.run_once()
         
         while True:
             schedule.run_pending()
@@ -0,0 +1,52 @@
+"""The daemon's parse workers outlive a poll and drop already-sent stories before cleaning them."""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from test_seen_copies import FEEDS, FeedTransport, rss
+from financial_newsletter import FinancialNewsletterBot, SeenArticleIndex, WarmArticlePool
+
+
+class ParsePoolTest(unittest.TestCase):
+
+    def test_pool_survives_polls_and_skips_sent_stories(self):
+        with tempfile.TemporaryDirectory() as state_dir:
+            with mock.patch.dict(os.environ, {
+                'NEWSBRIEF_STATE_DIR': state_dir,
+                'NEWSBRIEF_PROFILES': os.path.join(state_dir, 'profiles.json'),
+                'PARSE_PROCESSES': '1',
+            }):
+                bot = FinancialNewsletterBot()
+            bot.financial_feeds = {source: f'https://feeds.example/{index}' for index, source in enumerate(FEEDS)}
+            bot.http = FeedTransport({bot.financial_feeds[source]: rss(items) for source, items in FEEDS.items()})
+            bot.get_alternative_rss_urls = lambda source_name: []
+
+            self.assertTrue(bot.start_parse_pool())
+            try:
+                parse_pool = bot.parse_pool
+                list(bot.stream_feeds())
+                self.assertIs(bot.parse_pool, parse_pool)
+
+                # Marked after the workers started: they must query the index live
+                title, summary, link = FEEDS['PE Hub'][1]
+                bot.seen_index.mark_seen(SeenArticleIndex.keys_for(link, title, summary))
+                feed = bot.parse_feed_url('PE Hub', bot.financial_feeds['PE Hub'])
+                self.assertEqual(feed.already_seen, 1)
+                self.assertNotIn(title, [entry.title for entry in feed.entries])
+
+                pool = WarmArticlePool(bot.pool_max_age_hours)
+                bot.refresh_pool(pool, bot.financial_feeds)
+                self.assertNotIn(title, [article.title for article in pool.candidates()])
+                self.assertIs(bot.parse_pool, parse_pool)
+            finally:
+                bot.stop_parse_pool()
+            self.assertIsNone(bot.parse_pool)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+"""Mailed stories must leave the daemon's warm pool even when the seen-article index is disabled."""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from test_seen_copies import FEEDS, FeedTransport, rss
+from financial_newsletter import FinancialNewsletterBot, WarmArticlePool
+
+
+class PoolResetTest(unittest.TestCase):
+
+    def test_sent_articles_leave_pool_without_seen_index(self):
+        with tempfile.TemporaryDirectory() as state_dir:
+            with mock.patch.dict(os.environ, {
+                'NEWSBRIEF_STATE_DIR': state_dir,
+                'NEWSBRIEF_PROFILES': os.path.join(state_dir, 'profiles.json'),
+                'PARSE_PROCESSES': '0',
+                'SEEN_TTL_DAYS': '0',
+            }):
+                bot = FinancialNewsletterBot()
+            self.assertIsNone(bot.seen_index)
+            bot.financial_feeds = {source: f'https://feeds.example/{index}' for index, source in enumerate(FEEDS)}
+            bot.http = FeedTransport({bot.financial_feeds[source]: rss(items) for source, items in FEEDS.items()})
+            bot.get_alternative_rss_urls = lambda source_name: []
+
+            pool = WarmArticlePool(bot.pool_max_age_hours)
+            bot.refresh_pool(pool, bot.financial_feeds)
+            categorized = bot.select_by_category(pool.candidates())
+            mailed = [article.title for articles in categorized.values() for article in articles]
+            self.assertTrue(mailed)
+
+            sent_keys = bot.mark_articles_sent(categorized)
+            bot.rebuild_pool(pool, sent_keys)
+            self.assertFalse([article.title for article in pool.candidates() if article.title in mailed])
+
+            # The syndicated copy dropped by dedup must not come back on the next poll either
+            bot.refresh_pool(pool, bot.financial_feeds)
+            self.assertFalse([article.title for article in pool.candidates() if 'KKR agrees' in article.title])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""A story mailed once must not come back as a syndicated copy from another source in the next run."""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from financial_newsletter import FinancialNewsletterBot, HttpResponse
+
+SUMMARY = (
+    "KKR has agreed to take the European software group private, the buyout firm said on Monday, "
+    "valuing the company at about $4.1bn including debt. The private equity deal is backed by a "
+    "consortium of lenders and is expected to close in the first quarter after regulatory approval."
+)
+
+FEEDS = {
+    'PE Hub': [
+        ("KKR agrees to acquire European software group in $4.1bn take-private", SUMMARY, 'https://pehub.example/kkr'),
+        ("Blackstone closes record infrastructure fund at $30bn", "Blackstone said its latest private equity "
+         "infrastructure fund closed above target after strong demand from pension investors.", 'https://pehub.example/bx'),
+    ],
+    'Bloomberg Business': [
+        ("KKR agrees to acquire European software group in $4.1bn deal", SUMMARY, 'https://bloomberg.example/kkr'),
+        ("EQT raises venture capital fund for climate startups", "EQT said the venture capital fund will back "
+         "early-stage climate technology startups across Europe and North America.", 'https://bloomberg.example/eqt'),
+    ],
+}
+
+
+def rss(items):
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>t</title>'
+        + ''.join(
+            f'<item><title>{escape(title)}</title><link>{link}</link><description>{escape(summary)}</description></item>'
+            for title, summary, link in items
+        )
+        + '</channel></rss>'
+    ).encode('utf-8')
+
+
+class FeedTransport:
+    """Serves the FEEDS documents by URL"""
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    def get(self, url, params=None, headers=None, max_bytes=None, timeout=None):
+        return HttpResponse(url, 200, {}, self.documents[url])
+
+
+class SeenCopiesTest(unittest.TestCase):
+
+    def run_issue(self, state_dir, processes):
+        with mock.patch.dict(os.environ, {
+            'NEWSBRIEF_STATE_DIR': state_dir,
+            'NEWSBRIEF_PROFILES': os.path.join(state_dir, 'profiles.json'),
+            'PARSE_PROCESSES': str(processes),
+        }):
+            bot = FinancialNewsletterBot()
+        bot.financial_feeds = {source: f'https://feeds.example/{index}' for index, source in enumerate(FEEDS)}
+        bot.http = FeedTransport({bot.financial_feeds[source]: rss(items) for source, items in FEEDS.items()})
+        bot.get_alternative_rss_urls = lambda source_name: []
+
+        categorized = bot.fetch_financial_news()
+        bot.mark_articles_sent(categorized)
+        return [article.title for articles in categorized.values() for article in articles]
+
+    def check_two_runs(self, processes):
+        with tempfile.TemporaryDirectory() as state_dir:
+            first = self.run_issue(state_dir, processes)
+            self.assertEqual(sum('KKR agrees' in title for title in first), 1, first)
+
+            second = self.run_issue(state_dir, processes)
+            self.assertFalse([title for title in second if 'KKR agrees' in title], second)
+
+    def test_copy_not_resent_threads(self):
+        self.check_two_runs(processes=0)
+
+    def test_copy_not_resent_process_pool(self):
+        self.check_two_runs(processes=2)
+
+
+if __name__ == '__main__':
+    unittest.main()